@@ -1,22 +1,28 @@
-from flask import Flask
+# Keep this module cheap to import: the CLI scripts under app.services import
+# the package too, and only the web app needs Flask, the blueprints and Migrate.
 
-from app.services import facebook_leads
-from .config import Config
-from .extentions import db, migrate, bcrypt
-from .routes import bps
 
 def create_app():
+    from flask import Flask
+
+    from .config import Config
+    from .extentions import db, bcrypt
+    from .routes import bps
+
     app = Flask(__name__)
     app.config.from_object(Config)
 
     # Initialize Extensions
     db.init_app(app)
-    migrate.init_app(app, db)
     bcrypt.init_app(app)
 
+    # Migrate pulls in alembic, only needed for the `flask db` commands
+    if app.config["LOAD_MIGRATIONS"]:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
     # Blueprints
     for bp in bps:
         app.register_blueprint(bp)
 
     return app
-
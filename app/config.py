@@ -1,15 +1,68 @@
+import json
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     # It's recommended to set a strong, secret key in your environment variables for production
     SECRET_KEY = os.getenv("SECRET_KEY", "a_default_secret_key_for_development")
     SESSION_COOKIE_SAMESITE = 'Lax'
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+    # Optional read replica for the read-only dashboard views and exports,
+    # see services/read_routing.py
+    READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+    # After a user's own write their reads stay on the primary this long
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 10))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     FB_VERIFY_TOKEN=os.getenv("FB_VERIFY_TOKEN")
     GRAPH_API_ACCESS_TOKEN=os.getenv("GRAPH_API_ACCESS_TOKEN")
     GRAPH_API_BASE_URI="https://graph.facebook.com/v24.0"
     FB_PAGE_ID="769888559550570"
+    # Pages to ingest as a JSON list of {"page_id": ..., "access_token": ...},
+    # defaults to FB_PAGE_ID with GRAPH_API_ACCESS_TOKEN
+    FB_ACCOUNTS = json.loads(os.getenv("FB_ACCOUNTS", "null"))
+    FB_RATE_LIMIT_PER_SEC = float(os.getenv("FB_RATE_LIMIT_PER_SEC", 5))
+    # Each run crawls only the newest FB_MAX_POSTS posts of the last
+    # FB_MAX_POST_AGE_DAYS days (with all their comments/reactions), 0 = no limit
+    FB_MAX_POSTS = int(os.getenv("FB_MAX_POSTS", 100))
+    FB_MAX_POST_AGE_DAYS = float(os.getenv("FB_MAX_POST_AGE_DAYS", 30))
+    # On-disk Graph API response cache for retries and dev runs (e.g. ".graph_cache"),
+    # disabled when unset, see services/connectors/graph_cache.py
+    GRAPH_CACHE_DIR = os.getenv("GRAPH_CACHE_DIR")
+    GRAPH_CACHE_MAX_MB = float(os.getenv("GRAPH_CACHE_MAX_MB", 256))
+
+    # Connector runner threads (connector accounts ingested in parallel)
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 4))
+    # How often the runner writes hot-lead scores while ingesting
+    MOMENTUM_FLUSH_SECONDS = float(os.getenv("MOMENTUM_FLUSH_SECONDS", 30))
+
+    # Extraction profiling, see services/profiling.py ("sample", "cprofile" or unset)
+    EXTRACT_PROFILE = os.getenv("EXTRACT_PROFILE")
+    EXTRACT_PROFILE_DIR = os.getenv("EXTRACT_PROFILE_DIR", "profiles")
+
+    # Connection pool (shared by the web app, the extractor and the CLI scripts)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    # PgBouncer (transaction pooling) already pools server connections, so we
+    # don't keep our own pool and don't send startup parameters it would reject
+    DB_PGBOUNCER = _env_bool("DB_PGBOUNCER", False)
+
+    # Web workers can skip Flask-Migrate (and alembic) entirely, it's only
+    # needed for the `flask db ...` commands
+    LOAD_MIGRATIONS = _env_bool("LOAD_MIGRATIONS", True)
+
+    # Max rendered dashboard pages/fragments kept per worker (0 disables)
+    FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", 256))
@@ -0,0 +1,89 @@
+"""
+Shared SQLAlchemy engine factory
+One lazily created engine per database URL, used by the web app (through
+Flask-SQLAlchemy), the background extractor and the CLI scripts. Read-only
+views can be pointed at READ_DATABASE_URL, see app.services.read_routing.
+"""
+
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import NullPool
+
+from app.config import Config
+
+
+def engine_options(url=None):
+    """Build create_engine() keyword arguments from Config"""
+    url = make_url(url or Config.SQLALCHEMY_DATABASE_URI)
+    options = {"pool_pre_ping": Config.DB_POOL_PRE_PING}
+
+    # SQLite picks its own pool class, pool sizing doesn't apply
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    if Config.DB_PGBOUNCER:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=Config.DB_POOL_SIZE,
+            max_overflow=Config.DB_MAX_OVERFLOW,
+            pool_timeout=Config.DB_POOL_TIMEOUT,
+            pool_recycle=Config.DB_POOL_RECYCLE,
+        )
+
+    if url.get_backend_name() == "postgresql" and Config.DB_STATEMENT_TIMEOUT_MS and not Config.DB_PGBOUNCER:
+        options["connect_args"] = {"options": f"-c statement_timeout={Config.DB_STATEMENT_TIMEOUT_MS}"}
+
+    return options
+
+
+def _set_local_statement_timeout(conn):
+    """PgBouncer rejects the `options` startup parameter, so set it per transaction
+
+    A session-level SET would stick to whichever server connection PgBouncer
+    handed us and leak to its next client, SET LOCAL ends with the transaction.
+    Runs on the raw DBAPI connection, SQLAlchemy hasn't begun its own yet.
+    Alternatively drop DB_STATEMENT_TIMEOUT_MS and set it on the role:
+    ALTER ROLE <user> SET statement_timeout = '30s'
+    """
+    cursor = conn.connection.cursor()
+    cursor.execute(f"SET LOCAL statement_timeout = {int(Config.DB_STATEMENT_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def get_engine(url=None):
+    """Return the process-wide engine for `url` (defaults to DATABASE_URL)"""
+    url = make_url(url or Config.SQLALCHEMY_DATABASE_URI)
+    return _create_engine(url.render_as_string(hide_password=False))
+
+
+@lru_cache(maxsize=None)
+def _create_engine(url):
+    engine = create_engine(url, **engine_options(url))
+
+    if engine.dialect.name == "postgresql" and Config.DB_STATEMENT_TIMEOUT_MS and Config.DB_PGBOUNCER:
+        event.listen(engine, "begin", _set_local_statement_timeout)
+
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_session_factory():
+    """Thread-local session factory bound to the shared engine"""
+    return scoped_session(sessionmaker(bind=get_engine()))
+
+
+def read_database_url(replica=True):
+    """READ_DATABASE_URL if `replica` and one is configured, else DATABASE_URL"""
+    if replica and Config.READ_DATABASE_URL:
+        return Config.READ_DATABASE_URL
+    return Config.SQLALCHEMY_DATABASE_URI
+
+
+@lru_cache(maxsize=None)
+def get_read_session_factory(replica=True):
+    """Session factory for read-only work, on the replica when configured"""
+    return sessionmaker(bind=get_engine(read_database_url(replica)))
@@ -1,7 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
 
-db = SQLAlchemy()
-migrate = Migrate()
+from .database import get_engine
+
+
+class SharedEngineSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy that reuses the process-wide engine for the default bind"""
+
+    def _make_engine(self, bind_key, options, app):
+        if bind_key is None:
+            return get_engine(options["url"])
+        return super()._make_engine(bind_key, options, app)
+
+
+db = SharedEngineSQLAlchemy()
 bcrypt = Bcrypt()
@@ -0,0 +1,39 @@
+"""
+Fast JSON encoding and decoding
+Uses orjson when it is installed and the standard library otherwise, so it
+stays an optional dependency. Both paths take str or bytes, return bytes
+from dumps() and encode datetimes as ISO 8601 like the models' to_dict(),
+so rows can be encoded as they come out of the database.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    """Types neither encoder handles natively (stdlib: datetimes too)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default)
+else:
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj):
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
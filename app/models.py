@@ -1,7 +1,13 @@
 from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import object_session
 from .extentions import db, bcrypt
+from .streaming import row_to_dict
 
 
+def utcnow():
+    """Column default, evaluated per row (not once at import time)"""
+    return datetime.now(timezone.utc)
 
 
 # ==============================================================================
@@ -12,7 +18,7 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=utcnow)
 
     def set_password(self, password):
         self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
@@ -46,18 +52,27 @@ class Lead(db.Model):
     total_interactions = db.Column(db.Integer, default=0)
     total_comments = db.Column(db.Integer, default=0)
     total_reactions = db.Column(db.Integer, default=0)
+
+    # Recent engagement, flushed by services/hot_leads.py
+    momentum_1h = db.Column(db.Float, default=0)
+    momentum_24h = db.Column(db.Float, default=0)
+    momentum_7d = db.Column(db.Float, default=0)
+    hot_score = db.Column(db.Float, default=0, index=True)
+    momentum_updated_at = db.Column(db.DateTime)
     
     # Status
     status = db.Column(db.String(20), default="new")
     routed = db.Column(db.Boolean, default=False)
     
     # Timestamp
-    discovered_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    discovered_at = db.Column(db.DateTime, default=utcnow)
+    # Indexed for the dashboard's max(updated_at) watermark, see services/http_cache.py
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow, index=True)
     
     # Relationships
     comments = db.relationship('Comment', back_populates='lead', lazy='dynamic', cascade='all, delete-orphan')
     reactions = db.relationship('Reaction', back_populates='lead', lazy='dynamic', cascade='all, delete-orphan')
+    events = db.relationship('LeadEvent', back_populates='lead', lazy='dynamic', cascade='all, delete-orphan')
     
     def to_dict(self, include_interactions=True):
         """Convert lead to dictionary with optional interactions"""
@@ -73,6 +88,7 @@ class Lead(db.Model):
             'total_interactions': self.total_interactions,
             'total_comments': self.total_comments,
             'total_reactions': self.total_reactions,
+            'hot_score': self.hot_score,
             'status': self.status,
             'routed': self.routed,
             'discovered_at': self.discovered_at.isoformat() if self.discovered_at else None,
@@ -80,8 +96,12 @@ class Lead(db.Model):
         }
         
         if include_interactions:
-            data['comments'] = [comment.to_dict() for comment in self.comments.all()]
-            data['reactions'] = [reaction.to_dict() for reaction in self.reactions.all()]
+            # Plain rows instead of Comment/Reaction objects, one object's rows need no server-side cursor
+            session = object_session(self)
+            data['comments'] = [row_to_dict(row) for row in session.execute(
+                select(Comment.__table__).where(Comment.lead_id == self.id).order_by(Comment.id))]
+            data['reactions'] = [row_to_dict(row) for row in session.execute(
+                select(Reaction.__table__).where(Reaction.lead_id == self.id).order_by(Reaction.id))]
         
         return data
     
@@ -106,7 +126,7 @@ class Post(db.Model):
     total_reactions = db.Column(db.Integer, default=0)
     
     # Metadata
-    discovered_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    discovered_at = db.Column(db.DateTime, default=utcnow)
     
     # Relationships
     comments = db.relationship('Comment', back_populates='post', lazy='dynamic', cascade='all, delete-orphan')
@@ -126,8 +146,12 @@ class Post(db.Model):
         }
         
         if include_interactions:
-            data['comments'] = [comment.to_dict() for comment in self.comments.all()]
-            data['reactions'] = [reaction.to_dict() for reaction in self.reactions.all()]
+            # Plain rows instead of Comment/Reaction objects, one object's rows need no server-side cursor
+            session = object_session(self)
+            data['comments'] = [row_to_dict(row) for row in session.execute(
+                select(Comment.__table__).where(Comment.post_id == self.id).order_by(Comment.id))]
+            data['reactions'] = [row_to_dict(row) for row in session.execute(
+                select(Reaction.__table__).where(Reaction.post_id == self.id).order_by(Reaction.id))]
         
         return data
     
@@ -155,7 +179,7 @@ class Comment(db.Model):
     keywords_matched = db.Column(db.JSON)
     
     # Timestamp
-    discovered_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    discovered_at = db.Column(db.DateTime, default=utcnow)
     
     # Relationships
     post = db.relationship('Post', back_populates='comments')
@@ -193,7 +217,7 @@ class Reaction(db.Model):
     lead_id = db.Column(db.Integer, db.ForeignKey('leads.id'), nullable=False, index=True)
     
     # Timestamp
-    discovered_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    discovered_at = db.Column(db.DateTime, default=utcnow)
     
     # Relationships
     post = db.relationship('Post', back_populates='reactions')
@@ -217,3 +241,65 @@ class Reaction(db.Model):
     def __repr__(self):
         return f"<Reaction {self.reaction_type} by Lead:{self.lead_id} on Post:{self.post_id}>"
 
+
+# ==============================================================================
+# Lead Event Model
+# ==============================================================================
+
+class LeadEvent(db.Model):
+    """Denormalized per-lead activity feed, appended during ingestion"""
+    __tablename__ = 'lead_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    lead_id = db.Column(db.Integer, db.ForeignKey('leads.id'), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'))
+    event_type = db.Column(db.String(50), nullable=False)  # comment, reaction, reaction_change, reaction_removed
+    occurred_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    # What happened, copied so the timeline never joins back to comments/reactions
+    detail = db.Column(db.Text)  # Comment message, reaction type or 'OLD -> NEW' type change
+    platform_ref = db.Column(db.String(255))  # Platform id of the source object, if any
+
+    # Relationships
+    lead = db.relationship('Lead', back_populates='events')
+
+    __table_args__ = (
+        db.Index('ix_lead_events_lead_id_occurred_at', 'lead_id', 'occurred_at', 'id'),
+        db.Index('ix_lead_events_occurred_at', 'occurred_at'),
+    )
+
+    def to_dict(self):
+        """Convert event to dictionary"""
+        return {
+            'id': self.id,
+            'lead_id': self.lead_id,
+            'post_id': self.post_id,
+            'event_type': self.event_type,
+            'occurred_at': self.occurred_at.isoformat() if self.occurred_at else None,
+            'detail': self.detail,
+            'platform_ref': self.platform_ref,
+        }
+
+    def __repr__(self):
+        return f"<LeadEvent {self.event_type} by Lead:{self.lead_id} at:{self.occurred_at}>"
+
+# ==============================================================================
+# Connector Checkpoint Model
+# ==============================================================================
+
+class ConnectorCheckpoint(db.Model):
+    __tablename__ = 'connector_checkpoints'
+
+    id = db.Column(db.Integer, primary_key=True)
+    connector = db.Column(db.String(50), nullable=False)
+    account = db.Column(db.String(255), nullable=False)
+    cursor = db.Column(db.Text)  # Opaque resume position, NULL when the last run completed
+
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('connector', 'account', name='unique_checkpoint_per_account'),
+    )
+
+    def __repr__(self):
+        return f"<ConnectorCheckpoint {self.connector}:{self.account} at:{self.cursor}>"
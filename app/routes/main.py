@@ -1,11 +1,29 @@
-from flask import Blueprint, request, jsonify, session, make_response, render_template, redirect, url_for, Response
+from flask import Blueprint, request, jsonify, session, make_response, render_template, redirect, url_for, Response, abort, stream_with_context
 from functools import wraps
-from sqlalchemy import func
+import csv
+import io
+from sqlalchemy import func, select
 from ..models import User, Lead
 from ..extentions import db
+from ..config import Config
+from .. import fast_json
+from ..streaming import stream_batches
+from ..services import lead_reads, http_cache, lead_import, read_routing
 
 main_bp = Blueprint("main", __name__)
 
+# Read-your-writes: remember each user's last write, see services/read_routing.py
+main_bp.after_request(read_routing.record_write)
+
+# Rendered pages/fragments keyed by their data watermark, see services/http_cache.py
+fragment_cache = http_cache.FragmentCache(Config.FRAGMENT_CACHE_SIZE)
+
+API_MAX_LIMIT = 500
+
+def json_response(payload, status=200):
+    """Like jsonify() but encoded with fast_json, datetimes become ISO 8601"""
+    return Response(fast_json.dumps(payload), status=status, mimetype='application/json')
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -43,10 +61,25 @@ def logout():
 @main_bp.route('/')
 @login_required
 def index():
-    total_leads = db.session.query(func.count(Lead.id)).scalar()
-    unrouted_leads = db.session.query(func.count(Lead.id)).filter_by(routed=False).scalar()
+    with read_routing.read_session() as read_session:
+        watermark = tuple(read_session.execute(http_cache.leads_watermark_query()).one())
+        etag = http_cache.make_etag('index', watermark)
+        cached = http_cache.not_modified(etag)
+        if cached is not None:
+            return cached
+
+        html = fragment_cache.get(etag)
+        if html is None:
+            html = _render_index(read_session)
+            fragment_cache.set(etag, html)
+
+    return http_cache.cache_headers(make_response(html), etag)
+
+def _render_index(read_session):
+    total_leads = read_session.query(func.count(Lead.id)).scalar()
+    unrouted_leads = read_session.query(func.count(Lead.id)).filter_by(routed=False).scalar()
     
-    leads_by_platform = db.session.query(Lead.platform, func.count(Lead.id)) \
+    leads_by_platform = read_session.query(Lead.platform, func.count(Lead.id)) \
         .group_by(Lead.platform) \
         .all()
 
@@ -69,10 +102,26 @@ def leads():
         return jsonify({"message": "Lead created", "id": lead.id}), 201
 
     active_platform = request.args.get('platform', 'all')
-    platforms = db.session.query(Lead.platform).distinct().all()
-    platforms = [p[0] for p in platforms]
+    with read_routing.read_session() as read_session:
+        platforms = read_session.scalars(select(Lead.platform).distinct()).all()
     return render_template('leads.html', platforms=platforms, active_platform=active_platform)
 
+@main_bp.route('/leads/import', methods=['POST'])
+@login_required
+def import_leads():
+    """Bulk import a CSV or NDJSON request body, ?format=csv|ndjson"""
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = 'ndjson' if request.mimetype in ('application/x-ndjson', 'application/jsonl') else 'csv'
+
+    stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    try:
+        stats = lead_import.import_leads(stream, fmt)
+    except lead_import.ImportFormatError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(stats), 200
+
 @main_bp.route('/settings')
 @login_required
 def settings():
@@ -102,34 +151,36 @@ def export_leads():
     platform = request.args.get('platform')
     lead_ids = request.args.getlist('lead_ids')
 
-    query = Lead.query
+    query = select(Lead.id, Lead.platform, Lead.username, Lead.status, Lead.routed, Lead.discovered_at) \
+        .order_by(Lead.id)
 
     if platform and platform != 'all':
-        query = query.filter_by(platform=platform)
+        query = query.where(Lead.platform == platform)
 
     if export_type == 'selected':
         if not lead_ids:
             return jsonify({"error": "No leads selected"}), 400
-        query = query.filter(Lead.id.in_(lead_ids))
+        query = query.where(Lead.id.in_(lead_ids))
     elif export_type == 'unrouted':
-        query = query.filter_by(routed=False)
+        query = query.where(Lead.routed == False)
 
-    leads = query.all()
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['ID', 'Platform', 'Username', 'Status', 'Routed', 'Discovered At'])
+
+        # Server-side cursor, one CSV chunk per batch of rows
+        with read_routing.read_session() as read_session:
+            for rows in stream_batches(read_session, query):
+                writer.writerows(rows)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+        yield output.getvalue()
 
-    import io
-    import csv
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(['ID', 'Platform', 'Username', 'Status', 'Routed', 'Discovered At'])
-    
-    for lead in leads:
-        writer.writerow([lead.id, lead.platform, lead.username, lead.status, lead.routed, lead.discovered_at])
-    
-    output.seek(0)
-    
     return Response(
-        output,
+        stream_with_context(generate()),
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment;filename=leads.csv"}
     )
@@ -141,22 +192,90 @@ def get_leads_data():
     page = request.args.get('page', 1, type=int)
     per_page = 20
 
-    query = Lead.query
-    if platform and platform != 'all':
-        query = query.filter_by(platform=platform)
+    with read_routing.read_session() as read_session:
+        watermark = tuple(read_session.execute(http_cache.leads_watermark_query(platform)).one())
+        etag = http_cache.make_etag('leads-data', platform, page, watermark)
+        cached = http_cache.not_modified(etag)
+        if cached is not None:
+            return cached
 
-    leads = query.paginate(page=page, per_page=per_page, error_out=False)
+        html = fragment_cache.get(etag)
+        if html is None:
+            leads = lead_reads.fetch_leads_page(read_session, platform, page, per_page)
+            html = render_template("partials/_lead_row.html", leads=leads, active_platform=platform)
+            fragment_cache.set(etag, html)
 
-    return render_template("partials/_lead_row.html", leads=leads, active_platform=platform)
+    return http_cache.cache_headers(make_response(html), etag)
+
+
+@main_bp.route('/leads/hot')
+@login_required
+def hot_leads():
+    platform = request.args.get('platform', 'all')
+
+    with read_routing.read_session() as read_session:
+        leads = lead_reads.fetch_hot_leads(read_session, platform)
+
+    return render_template('hot_leads.html', leads=leads, active_platform=platform)
 
-    
 
 @main_bp.route('/lead/<int:lead_id>')
 @login_required
 def view_lead(lead_id):
+    with read_routing.read_session() as read_session:
+        watermark = read_session.execute(http_cache.lead_watermark_query(lead_id)).first()
+        if watermark is None:
+            abort(404)
+
+        etag = http_cache.make_etag('lead', lead_id, tuple(watermark))
+        cached = http_cache.not_modified(etag)
+        if cached is not None:
+            return cached
 
-    lead = Lead.query.get_or_404(lead_id)
+        html = fragment_cache.get(etag)
+        if html is None:
+            lead = read_session.get(Lead, lead_id)
+            html = render_template('lead.html', lead=lead)
+            fragment_cache.set(etag, html)
+
+    return http_cache.cache_headers(make_response(html), etag)
+
+
+@main_bp.route('/lead/<int:lead_id>/timeline')
+@login_required
+def lead_timeline(lead_id):
+    """Lead activity newest first, ?cursor= from the previous page
+
+    Returns table rows for HTMX requests and JSON otherwise.
+    """
+    cursor = request.args.get('cursor')
+    limit = min(max(request.args.get('limit', 50, type=int), 1), API_MAX_LIMIT)
+
+    with read_routing.read_session() as read_session:
+        events, next_cursor = lead_reads.fetch_lead_timeline(read_session, lead_id, cursor, limit)
+
+    if request.headers.get('HX-Request'):
+        return render_template('partials/_lead_event_row.html', lead_id=lead_id, events=events, next_cursor=next_cursor)
+
+    return json_response({
+        "events": [event.to_dict() for event in events],
+        "next_cursor": next_cursor,
+    })
+
+
+@main_bp.route('/api/leads', methods=['GET'])
+@login_required
+def api_leads():
+    """JSON leads listing, keyset paginated with ?after_id=<last id seen>"""
+    platform = request.args.get('platform', 'all')
+    after_id = request.args.get('after_id', 0, type=int)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), API_MAX_LIMIT)
 
-    return render_template('lead.html', lead=lead)
+    with read_routing.read_session() as read_session:
+        # Plain rows straight to JSON, no ORM objects or to_dict() per lead
+        leads = lead_reads.fetch_leads_after(read_session, platform, after_id, limit)
 
-    
\ No newline at end of file
+    return json_response({
+        "leads": leads,
+        "next_after_id": leads[-1]['id'] if len(leads) == limit else None,
+    })
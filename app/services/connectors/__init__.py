@@ -0,0 +1,8 @@
+from .base import Connector, RateBudget, Page, PostRecord, CommentRecord, ReactionRecord
+from .facebook import FacebookConnector
+
+
+# platform -> connector class
+CONNECTORS = {
+    FacebookConnector.platform: FacebookConnector,
+}
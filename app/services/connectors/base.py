@@ -0,0 +1,129 @@
+"""
+Connector interface for lead sources
+A connector knows how to page through one platform account (fetch_pages) and
+how to turn each raw page into normalized records (normalize). Persistence,
+checkpoints, concurrency and rate budgets are handled by the runner.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from threading import Lock
+
+
+# ==============================================================================
+# Normalized records
+# ==============================================================================
+
+@dataclass(slots=True)
+class PostRecord:
+    platform_post_id: str
+    message: str = None
+    created_time: str = None
+    post_url: str = None
+
+
+@dataclass(slots=True)
+class CommentRecord:
+    platform_comment_id: str
+    post_id: str  # platform post id
+    user_id: str
+    username: str
+    message: str = ''
+    created_time: str = None
+
+
+@dataclass(slots=True)
+class ReactionRecord:
+    post_id: str  # platform post id
+    user_id: str
+    username: str
+    reaction_type: str
+
+
+@dataclass(slots=True)
+class Page:
+    """One raw page fetched from the platform
+
+    kind is 'posts', 'comments', 'reactions' or 'checkpoint'. A checkpoint page
+    carries no items: everything yielded before it is safe to commit, and a
+    resumed run can restart from `checkpoint`. `final` marks the last page of a
+    post's comments or reactions, after which the post's reaction set is
+    complete and reactions missing from it are removed.
+    """
+    kind: str
+    items: list = field(default_factory=list)
+    post_id: str = None
+    checkpoint: str = None
+    final: bool = True
+
+
+# ==============================================================================
+# Rate budget
+# ==============================================================================
+
+class RateBudget:
+    """Token bucket shared by every account of a connector"""
+
+    def __init__(self, rate_per_sec, burst=None):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = burst or max(1, int(rate_per_sec))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Block until a request may be made"""
+        if not self.rate_per_sec:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate_per_sec
+            time.sleep(wait)
+
+
+# ==============================================================================
+# Connector
+# ==============================================================================
+
+class Connector(ABC):
+    """Base class for a lead source, one instance per account"""
+
+    # Stored in Lead.platform and used as the registry key
+    platform = None
+
+    @classmethod
+    def configured_accounts(cls):
+        """Accounts to ingest when none are given explicitly"""
+        return []
+
+    @classmethod
+    def rate_limit_per_sec(cls):
+        """Request budget shared by all accounts of this connector, 0 for unlimited"""
+        return 0
+
+    def __init__(self, account, budget=None):
+        self.account = account
+        self.budget = budget or RateBudget(0)
+
+    @property
+    @abstractmethod
+    def account_id(self):
+        """Stable identifier of the account, used for checkpoints"""
+
+    @abstractmethod
+    def fetch_pages(self, checkpoint=None):
+        """Yield Page objects, resuming from `checkpoint` when given"""
+
+    @abstractmethod
+    def normalize(self, page):
+        """Turn a raw Page into a list of Post/Comment/ReactionRecord"""
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.platform}:{self.account_id}>"
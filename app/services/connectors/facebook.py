@@ -0,0 +1,179 @@
+"""
+Facebook Page connector (Graph API)
+Pages through a Page's posts and, for each post, its comments and reactions.
+Each run only looks at recent posts: the newest FB_MAX_POSTS posts created in
+the last FB_MAX_POST_AGE_DAYS days, so routine runs don't re-crawl the Page's
+whole history.
+"""
+
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+
+from app import fast_json
+from app.config import Config
+from app.services.profiling import stage
+from .base import Connector, Page, PostRecord, CommentRecord, ReactionRecord
+from .graph_cache import get_graph_cache
+
+PAGE_LIMIT = 100
+
+
+def graph_get(uri, budget=None):
+    """GET a Graph API URL and return the decoded payload
+
+    Served from the response cache when enabled (see graph_cache.py), `budget`
+    is only spent on requests that actually reach the API.
+    """
+    cache = get_graph_cache()
+    cached = cache.get(uri) if cache is not None else None
+    if cached is not None and cached.fresh:
+        body = cached.body
+    else:
+        headers = {'If-None-Match': cached.etag} if cached is not None and cached.etag else {}
+        if budget is not None:
+            with stage('rate_limit'):
+                budget.acquire()
+        with stage('http'):
+            req = requests.get(uri, headers=headers)
+
+        if req.status_code == 304 and cached is not None:
+            cache.refresh(uri)
+            body = cached.body
+        elif req.status_code == 200:
+            body = req.content
+            if cache is not None:
+                cache.put(uri, body, req.headers.get('ETag'))
+        else:
+            raise Exception(f"Facebook API Error: {req.status_code}")
+
+    with stage('json'):
+        return fast_json.loads(body)
+
+
+def with_token(uri, token):
+    """`uri` with its access_token set to `token`
+
+    paging.next links carry the token of the request that produced them, and
+    cached pages are shared between tokens and accounts (see graph_cache.py),
+    so followed links are always re-signed with the connector's own token.
+    """
+    parts = urlsplit(uri)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'access_token']
+    query.append(('access_token', token))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def posts_since(max_age_days, now=None):
+    """Unix time of the oldest post to crawl, rounded down to midnight UTC
+
+    Part of the posts URL, so it only changes once a day and the response
+    cache (keyed by URL) can serve and revalidate the posts list.
+    """
+    cutoff = (time.time() if now is None else now) - max_age_days * 86400
+    return int(cutoff // 86400 * 86400)
+
+
+class FacebookConnector(Connector):
+    platform = 'facebook'
+
+    @classmethod
+    def configured_accounts(cls):
+        if Config.FB_ACCOUNTS:
+            return Config.FB_ACCOUNTS
+        return [{'page_id': Config.FB_PAGE_ID, 'access_token': Config.GRAPH_API_ACCESS_TOKEN}]
+
+    @classmethod
+    def rate_limit_per_sec(cls):
+        return Config.FB_RATE_LIMIT_PER_SEC
+
+    @property
+    def account_id(self):
+        return self.account['page_id']
+
+    def _get(self, uri):
+        return graph_get(uri, self.budget)
+
+    def _edge_pages(self, post_id, edge, fields):
+        """Follow paging.next for one edge of a post"""
+        base_uri = Config.GRAPH_API_BASE_URI
+        token = self.account['access_token']
+        uri = f"{base_uri}/{post_id}/{edge}?fields={fields}&limit={PAGE_LIMIT}&access_token={token}"
+        while uri:
+            payload = self._get(uri)
+            uri = payload.get('paging', {}).get('next')
+            if uri:
+                uri = with_token(uri, token)
+            yield Page(edge, payload.get('data', []), post_id=post_id, final=uri is None)
+
+    def fetch_pages(self, checkpoint=None):
+        base_uri = Config.GRAPH_API_BASE_URI
+        token = self.account['access_token']
+        page_id = self.account['page_id']
+
+        limit = min(PAGE_LIMIT, Config.FB_MAX_POSTS or PAGE_LIMIT)
+        uri = f"{base_uri}/{page_id}/posts?fields=id,message,created_time,permalink_url&limit={limit}&access_token={token}"
+        if Config.FB_MAX_POST_AGE_DAYS:
+            uri += f"&since={posts_since(Config.FB_MAX_POST_AGE_DAYS)}"
+        if checkpoint:
+            uri += f"&after={checkpoint}"
+
+        remaining = Config.FB_MAX_POSTS or None
+        while uri:
+            payload = self._get(uri)
+            posts = payload.get('data', [])
+            if remaining is not None:
+                posts = posts[:remaining]
+                remaining -= len(posts)
+            yield Page('posts', posts)
+
+            for post_data in posts:
+                yield from self._edge_pages(post_data['id'], 'comments', 'id,message,created_time,from')
+                yield from self._edge_pages(post_data['id'], 'reactions', 'id,name,type')
+
+            paging = payload.get('paging', {})
+            uri = paging.get('next') if remaining != 0 else None
+            if uri:
+                uri = with_token(uri, token)
+            # Only resume from a cursor if there is something after it
+            yield Page('checkpoint', checkpoint=paging.get('cursors', {}).get('after') if uri else None)
+
+    def normalize(self, page):
+        if page.kind == 'posts':
+            return [
+                PostRecord(
+                    platform_post_id=post_data['id'],
+                    message=post_data.get('message'),
+                    created_time=post_data.get('created_time'),
+                    post_url=post_data.get('permalink_url')
+                )
+                for post_data in page.items
+            ]
+
+        if page.kind == 'comments':
+            return [
+                CommentRecord(
+                    platform_comment_id=comment_data['id'],
+                    post_id=page.post_id,
+                    user_id=comment_data['from']['id'],
+                    username=comment_data['from']['name'],
+                    message=comment_data.get('message', ''),
+                    created_time=comment_data.get('created_time')
+                )
+                # `from` is omitted for users who haven't granted the app access
+                for comment_data in page.items if 'from' in comment_data
+            ]
+
+        if page.kind == 'reactions':
+            return [
+                ReactionRecord(
+                    post_id=page.post_id,
+                    user_id=reaction_data['id'],
+                    username=reaction_data['name'],
+                    reaction_type=reaction_data['type']
+                )
+                for reaction_data in page.items
+            ]
+
+        return []
@@ -0,0 +1,145 @@
+"""
+On-disk cache of Graph API responses
+Lets retries and dev runs replay pages they already downloaded instead of
+spending the rate budget again. Enabled by setting GRAPH_CACHE_DIR.
+
+Entries are keyed by URL without the access token, so rotating tokens or
+running several accounts of the same Page share them. Cached bodies keep the
+original token in their paging links, the connector re-signs those before
+following them (facebook.with_token). Bodies are stored
+zlib-compressed in a single SQLite file and the least recently used ones are
+evicted once the file holds more than GRAPH_CACHE_MAX_MB. An entry is fresh
+for its edge's TTL; after that it is revalidated with If-None-Match when the
+API gave us an ETag, and a 304 reuses the stored body.
+"""
+
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.config import Config
+
+# Query parameters that identify the caller, not the data
+SECRET_PARAMS = frozenset(('access_token', 'appsecret_proof'))
+
+# Graph edge -> seconds a cached page is used without asking the API
+TTLS = {
+    'posts': 5 * 60,
+    'comments': 15 * 60,
+    'reactions': 15 * 60,
+}
+DEFAULT_TTL = 60
+
+
+def cache_key(uri):
+    """`uri` without secrets and with its query parameters in a stable order"""
+    parts = urlsplit(uri)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def ttl_for(key):
+    edge = urlsplit(key).path.rstrip('/').rsplit('/', 1)[-1]
+    return TTLS.get(edge, DEFAULT_TTL)
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    fresh: bool
+
+
+class GraphCache:
+    """Size-bounded LRU of compressed response bodies, safe to share between threads"""
+
+    def __init__(self, path, max_bytes, clock=time.time):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT, stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)")
+        # Running size of the stored bodies, kept up to date by put() and _evict()
+        self._total = self._stored_bytes()
+
+    def get(self, uri):
+        """The cached response for `uri` or None, marks it as recently used"""
+        key = cache_key(uri)
+        now = self.clock()
+        with self._lock:
+            row = self._db.execute("SELECT etag, stored_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        etag, stored_at, body = row
+        return CachedResponse(zlib.decompress(body), etag, now - stored_at < ttl_for(key))
+
+    def put(self, uri, body, etag=None):
+        key = cache_key(uri)
+        compressed = zlib.compress(body)
+        now = self.clock()
+        with self._lock:
+            replaced = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, stored_at, accessed_at, size, body)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, now, now, len(compressed), compressed)
+            )
+            self._total += len(compressed) - (replaced[0] if replaced else 0)
+            self._evict()
+
+    def refresh(self, uri):
+        """The API confirmed the cached body is current (304), restart its TTL"""
+        now = self.clock()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, cache_key(uri))
+            )
+
+    def _stored_bytes(self):
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        # Other processes may share the file, recount before evicting
+        total = self._stored_bytes()
+        # Oldest first, down to 90% so we don't evict on every put
+        evicted = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes * 0.9:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self._total = total
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.execute("VACUUM")
+            self._total = 0
+
+
+@lru_cache(maxsize=None)
+def get_graph_cache():
+    """Process-wide cache, None when GRAPH_CACHE_DIR is not set"""
+    if not Config.GRAPH_CACHE_DIR:
+        return None
+    os.makedirs(Config.GRAPH_CACHE_DIR, exist_ok=True)
+    return GraphCache(
+        os.path.join(Config.GRAPH_CACHE_DIR, "graph.sqlite3"),
+        int(Config.GRAPH_CACHE_MAX_MB * 1024 * 1024)
+    )
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Concurrent ingestion runner
+Drives every (connector, account) pair on a thread pool. Each job has its own
+session, commits at the connector's checkpoints and records the checkpoint so
+a crashed run resumes where it stopped. Accounts of the same connector share
+one rate budget. New interactions feed the hot-lead tracker, which the
+runner flushes to the leads table every MOMENTUM_FLUSH_SECONDS.
+
+Usage: python -m app.services.connectors.runner [--connector facebook] [--workers 4] [--profile]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+from app.config import Config
+from app.database import get_session_factory
+from app.models import Lead, ConnectorCheckpoint
+from app.services.ingest import RecordWriter
+from app.services.hot_leads import get_tracker
+from app.services.profiling import stage, profile_run, MODES
+from . import CONNECTORS
+from .base import RateBudget
+
+
+def load_checkpoint(session, connector):
+    row = session.query(ConnectorCheckpoint).filter_by(
+        connector=connector.platform, account=str(connector.account_id)
+    ).first()
+    return row.cursor if row else None
+
+
+def save_checkpoint(session, connector, cursor):
+    row = session.query(ConnectorCheckpoint).filter_by(
+        connector=connector.platform, account=str(connector.account_id)
+    ).first()
+    if row is None:
+        row = ConnectorCheckpoint(connector=connector.platform, account=str(connector.account_id))
+        session.add(row)
+    row.cursor = cursor
+
+
+def flush_momentum():
+    """Write the hot-lead tracker's current scores in their own transaction
+
+    Returns the number of leads written. Never raises: scores are derived
+    data, a failed flush is reported and the next one writes them.
+    """
+    session = get_session_factory()()
+    try:
+        tracker = get_tracker(session)
+        flushed = tracker.flush(session)
+        session.commit()
+        tracker.forget_quiet(flushed)
+        return len(flushed)
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Hot-lead score flush failed, retrying on the next flush: {str(e)}")
+        return 0
+    finally:
+        session.close()
+
+
+def run_connector(connector):
+    """Ingest one account, return its stats"""
+    sessions = get_session_factory()
+    session = sessions()
+    writer = RecordWriter(session, connector.platform, get_tracker(session))
+
+    try:
+        for page in connector.fetch_pages(load_checkpoint(session, connector)):
+            if page.kind == 'checkpoint':
+                with stage('db'):
+                    save_checkpoint(session, connector, page.checkpoint)
+                    writer.commit()
+                continue
+
+            with stage('normalize'):
+                records = connector.normalize(page)
+            with stage('db'):
+                writer.write(page.kind, records)
+                if page.post_id and page.final:
+                    writer.finish_edge(page.kind, page.post_id)
+
+        with stage('db'):
+            save_checkpoint(session, connector, None)
+            writer.commit()
+        return writer.stats
+
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        # Thread-local session, don't leak it into the next job on this thread
+        sessions.remove()
+
+
+def build_connectors(platforms=None):
+    """One connector per configured account, sharing a budget per platform"""
+    connectors = []
+    for platform in platforms or CONNECTORS:
+        connector_cls = CONNECTORS[platform]
+        budget = RateBudget(connector_cls.rate_limit_per_sec())
+        for account in connector_cls.configured_accounts():
+            connectors.append(connector_cls(account, budget))
+    return connectors
+
+
+def run_connectors(connectors, max_workers=None):
+    """Run connectors in parallel, return {connector: stats or exception}"""
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers or Config.INGEST_WORKERS) as pool:
+        pending = {pool.submit(run_connector, connector): connector for connector in connectors}
+        while pending:
+            done, _ = wait(pending, timeout=Config.MOMENTUM_FLUSH_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                connector = pending.pop(future)
+                try:
+                    results[connector] = future.result()
+                except Exception as e:
+                    results[connector] = e
+            # Only this thread flushes, so score updates never race each other
+            flush_momentum()
+    return results
+
+
+def run_connectors_inline(connectors):
+    """Run connectors one after another in the calling thread, same results as run_connectors()"""
+    results = {}
+    for connector in connectors:
+        try:
+            results[connector] = run_connector(connector)
+        except Exception as e:
+            results[connector] = e
+        flush_momentum()
+    return results
+
+
+def run_ingestion(platforms=None, max_workers=None, profile=None):
+    """Main ingestion function - call this from your scheduler"""
+    print(f"\n{'='*60}")
+    print(f"Starting ingestion at {datetime.now()}")
+    print(f"{'='*60}\n")
+
+    with profile_run('ingestion', profile) as profiler:
+        connectors = build_connectors(platforms)
+        if profiler is not None and profiler.calling_thread_only:
+            print("cProfile only sees the calling thread, running accounts one at a time\n")
+            results = run_connectors_inline(connectors)
+        else:
+            results = run_connectors(connectors, max_workers)
+
+    totals = {
+        'posts': 0,
+        'new_comments': 0,
+        'new_reactions': 0,
+        'changed_reactions': 0,
+        'removed_reactions': 0,
+        'failed': 0,
+    }
+    for connector, result in results.items():
+        if isinstance(result, Exception):
+            totals['failed'] += 1
+            print(f"❌ {connector}: {str(result)}")
+            continue
+        print(f"✓ {connector}: {result['posts']} posts, "
+              f"{result['new_comments']} new comments, {result['new_reactions']} new reactions")
+        for key in ('posts', 'new_comments', 'new_reactions', 'changed_reactions', 'removed_reactions'):
+            totals[key] += result[key]
+
+    session = get_session_factory()()
+    try:
+        totals['total_leads'] = session.query(Lead).count()
+    finally:
+        session.close()
+
+    print(f"\n{'='*60}")
+    print(f"Ingestion completed!")
+    print(f"Posts: {totals['posts']}")
+    print(f"New comments: {totals['new_comments']}")
+    print(f"New reactions: {totals['new_reactions']}")
+    print(f"Changed reactions: {totals['changed_reactions']}, removed: {totals['removed_reactions']}")
+    print(f"Failed accounts: {totals['failed']}")
+    print(f"Total leads: {totals['total_leads']}")
+    print(f"{'='*60}\n")
+
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run lead source connectors")
+    parser.add_argument("--connector", action="append", choices=sorted(CONNECTORS),
+                        help="connector to run, repeatable (default: all)")
+    parser.add_argument("--workers", type=int, help="parallel accounts (default: INGEST_WORKERS)")
+    parser.add_argument("--profile", nargs="?", const="sample", choices=MODES,
+                        help="profile the run (default mode: sample, or set EXTRACT_PROFILE), "
+                             "cprofile runs the accounts one at a time")
+    args = parser.parse_args()
+
+    run_ingestion(args.connector, args.workers, args.profile)
@@ -4,18 +4,12 @@ Simple script to create a new user
 Usage: python -m app.services.create_user
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from app.models import User
-from app.config import Config
-
-# Create engine and session
-engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
-Session = sessionmaker(bind=engine)
+from app.database import get_session_factory
 
 def create_user(email, password):
     """Create a new user"""
-    session = Session()
+    session = get_session_factory()()
     
     try:
         # Check if user already exists
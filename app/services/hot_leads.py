@@ -0,0 +1,246 @@
+"""
+Hot-lead detection
+Keeps per-lead sliding-window engagement counters (last 1h / 24h / 7d) in
+memory, fed by ingestion one event at a time, and periodically flushes the
+windowed totals and a combined hot_score to the leads table.
+
+Each window is a ring of time buckets, so recording an event is O(1) and old
+buckets are zeroed lazily as time moves forward, nothing is ever recomputed
+from the comments table.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+
+from sqlalchemy import bindparam, select, update
+
+from app.models import Lead, LeadEvent, utcnow
+
+# name -> (bucket size in seconds, number of buckets)
+WINDOWS = {
+    '1h': (60, 60),
+    '24h': (3600, 24),
+    '7d': (3600, 24 * 7),
+}
+
+# hot_score = sum(window total * weight)
+WINDOW_WEIGHTS = {
+    '1h': 1.0,
+    '24h': 0.25,
+    '7d': 0.05,
+}
+
+EVENT_WEIGHTS = {
+    'comment': 3.0,
+    'reaction': 1.0,
+    'reaction_change': 0.5,
+    'reaction_removed': 0.0,
+}
+
+REACTION_WEIGHTS = {
+    'LOVE': 1.5,
+    'WOW': 1.2,
+    'CARE': 1.2,
+    'LIKE': 1.0,
+    'HAHA': 1.0,
+    'SAD': 0.5,
+    'ANGRY': 0.5,
+}
+
+
+def event_weight(kind, reaction_type=None, intent_score=None):
+    """Weight of one event, comments with a known intent count for more"""
+    weight = EVENT_WEIGHTS.get(kind, 1.0)
+    if kind in ('reaction', 'reaction_change'):
+        weight *= REACTION_WEIGHTS.get(reaction_type, 1.0)
+    if intent_score:
+        weight *= 1 + intent_score
+    return weight
+
+
+class WindowCounter:
+    """Sum of weights over the last `bucket_seconds * n_buckets` seconds"""
+
+    __slots__ = ('bucket_seconds', 'buckets', 'head', 'total')
+
+    def __init__(self, bucket_seconds, n_buckets):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = [0.0] * n_buckets
+        self.head = None  # Absolute bucket number of the newest bucket
+        self.total = 0.0
+
+    def advance(self, now):
+        """Zero the buckets that fell out of the window since the last call"""
+        current = int(now // self.bucket_seconds)
+        if self.head is None:
+            self.head = current
+            return
+        if current <= self.head:
+            return
+
+        n_buckets = len(self.buckets)
+        if current - self.head >= n_buckets:
+            self.buckets = [0.0] * n_buckets
+            self.total = 0.0
+        else:
+            for bucket in range(self.head + 1, current + 1):
+                index = bucket % n_buckets
+                self.total -= self.buckets[index]
+                self.buckets[index] = 0.0
+        self.head = current
+
+    def add(self, at, weight, now):
+        self.advance(now)
+        bucket = int(at // self.bucket_seconds)
+        # Ignore events older than the window or in the future
+        if bucket > self.head or self.head - bucket >= len(self.buckets):
+            return
+        self.buckets[bucket % len(self.buckets)] += weight
+        self.total += weight
+
+    def value(self, now):
+        self.advance(now)
+        # Float drift from repeated add/subtract
+        if self.total < 1e-9:
+            self.total = 0.0
+        return self.total
+
+
+class MomentumTracker:
+    """Sliding-window counters for every lead with recent activity"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._leads = {}  # lead_id -> {window name: WindowCounter}
+        self._lock = Lock()
+
+    def record(self, lead_id, weight, at=None):
+        """Count one event for `lead_id` at `at` (datetime or epoch seconds, default now)"""
+        now = self.clock()
+        if at is None:
+            at = now
+        elif isinstance(at, datetime):
+            # Naive datetimes are stored as UTC
+            at = (at if at.tzinfo else at.replace(tzinfo=timezone.utc)).timestamp()
+
+        with self._lock:
+            for counter in self._counters(lead_id).values():
+                counter.add(at, weight, now)
+
+    def _counters(self, lead_id):
+        counters = self._leads.get(lead_id)
+        if counters is None:
+            counters = {name: WindowCounter(*size) for name, size in WINDOWS.items()}
+            self._leads[lead_id] = counters
+        return counters
+
+    def snapshot(self):
+        """{lead_id: {window: total}} for every tracked lead"""
+        now = self.clock()
+        with self._lock:
+            return {
+                lead_id: {name: counter.value(now) for name, counter in counters.items()}
+                for lead_id, counters in self._leads.items()
+            }
+
+    def forget_quiet(self, lead_ids):
+        """Stop tracking leads of `lead_ids` whose windows are all empty, once their zeros are written"""
+        now = self.clock()
+        with self._lock:
+            for lead_id in lead_ids:
+                counters = self._leads.get(lead_id)
+                if counters is not None and not any(counter.value(now) for counter in counters.values()):
+                    del self._leads[lead_id]
+
+    def __len__(self):
+        return len(self._leads)
+
+    def seed(self, session, since=None):
+        """Rebuild the counters from lead_events, once per process"""
+        since = since or utcnow() - timedelta(seconds=max(size * count for size, count in WINDOWS.values()))
+        rows = session.execute(
+            select(LeadEvent.lead_id, LeadEvent.event_type, LeadEvent.detail, LeadEvent.occurred_at)
+            .where(LeadEvent.occurred_at >= since)
+            .execution_options(yield_per=5000)
+        )
+        for lead_id, event_type, detail, occurred_at in rows:
+            if event_type == 'reaction_change':
+                detail = detail.rsplit(' -> ', 1)[-1]
+            weight = event_weight(event_type, detail if event_type != 'comment' else None)
+            if weight:
+                self.record(lead_id, weight, occurred_at)
+
+        # Leads that were hot last time but went quiet, so the next flush zeroes them
+        with self._lock:
+            for lead_id in session.scalars(select(Lead.id).where(Lead.hot_score > 0)):
+                self._counters(lead_id)
+
+    def flush(self, session):
+        """Write windowed totals and hot_score for every tracked lead, returns the lead ids written
+
+        Rows that ingestion workers still hold locked are skipped (FOR NO KEY
+        UPDATE SKIP LOCKED, a no-op on SQLite) and written by a later flush, so
+        the flush never waits on or deadlocks with a page transaction. Only
+        non-key columns change, so this lock doesn't conflict with the FOR KEY
+        SHARE lock that inserting a lead's comments, reactions and events takes
+        through their foreign keys: active leads are still written.
+        """
+        values = self.snapshot()
+        if not values:
+            return []
+
+        leads = Lead.__table__
+        # Lock in id order, skipping rows in flight
+        lead_ids = session.scalars(
+            select(leads.c.id)
+            .where(leads.c.id.in_(list(values)))
+            .order_by(leads.c.id)
+            .with_for_update(skip_locked=True, key_share=True)
+        ).all()
+        if not lead_ids:
+            return []
+
+        stmt = (
+            update(leads)
+            .where(leads.c.id == bindparam('b_id'))
+            .values(
+                momentum_1h=bindparam('b_1h'),
+                momentum_24h=bindparam('b_24h'),
+                momentum_7d=bindparam('b_7d'),
+                hot_score=bindparam('b_hot_score'),
+                momentum_updated_at=utcnow(),
+                # A score refresh isn't an edit, keep the dashboard ETags valid
+                updated_at=leads.c.updated_at,
+            )
+        )
+        session.execute(stmt, [
+            {
+                'b_id': lead_id,
+                'b_1h': values[lead_id]['1h'],
+                'b_24h': values[lead_id]['24h'],
+                'b_7d': values[lead_id]['7d'],
+                'b_hot_score': hot_score(values[lead_id]),
+            }
+            for lead_id in lead_ids
+        ])
+        return lead_ids
+
+
+def hot_score(windows):
+    return sum(windows[name] * weight for name, weight in WINDOW_WEIGHTS.items())
+
+
+_tracker = None
+_tracker_lock = Lock()
+
+
+def get_tracker(session=None):
+    """Process-wide tracker, seeded from lead_events on first use when given a session"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = MomentumTracker()
+            if session is not None:
+                _tracker.seed(session)
+        return _tracker
@@ -0,0 +1,88 @@
+"""
+Conditional GET support for the dashboard views
+ETags are derived from cheap watermark queries (max updated_at / max id / count)
+and rendered HTML is kept in a small per-process LRU keyed by the same
+watermark, so a repeated HTMX poll costs one aggregate query at most.
+"""
+
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+from flask import request, Response
+from sqlalchemy import select, func
+
+from app.models import Lead
+
+
+# ==============================================================================
+# Watermarks
+# ==============================================================================
+
+def leads_watermark_query(platform=None):
+    """Changes whenever a lead is added, updated or deleted"""
+    query = select(func.max(Lead.updated_at), func.max(Lead.id), func.count(Lead.id))
+    if platform and platform != 'all':
+        query = query.where(Lead.platform == platform)
+    return query
+
+
+def lead_watermark_query(lead_id):
+    """Changes whenever the lead row changes, counters included"""
+    return select(Lead.updated_at, Lead.total_comments, Lead.total_reactions).where(Lead.id == lead_id)
+
+
+def make_etag(*parts):
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def not_modified(etag):
+    """304 response if the client already has `etag`, else None"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        cache_headers(response, etag)
+        return response
+    return None
+
+
+def cache_headers(response, etag):
+    """Let the browser (and HTMX) revalidate every time, never share between users"""
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# ==============================================================================
+# Rendered fragment cache
+# ==============================================================================
+
+class FragmentCache:
+    """Thread-safe LRU of rendered HTML"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key, html):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,386 @@
+"""
+Persistence side of ingestion, shared by every connector
+Turns normalized records (see app.services.connectors.base) into Lead, Post,
+Comment and Reaction rows. No Flask app context needed.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import bindparam, select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Lead, Post, Comment, Reaction, LeadEvent, utcnow
+from app.services.hot_leads import event_weight
+
+
+def parse_time(value):
+    """Graph API style timestamps ('2025-11-20T10:00:00+0000') to datetime"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('+0000', '+00:00'))
+    return value
+
+
+def _insert_or_get(session, obj, model, **unique):
+    """Insert `obj`, or load the row another worker inserted concurrently"""
+    try:
+        with session.begin_nested():
+            session.add(obj)
+            session.flush()
+        return obj
+    except IntegrityError:
+        return session.query(model).filter_by(**unique).one()
+
+
+def _new_lead(user_id, username, platform):
+    return Lead(
+        platform_user_id=user_id,
+        username=username,
+        platform=platform,
+        total_interactions=0,
+        total_comments=0,
+        total_reactions=0,
+    )
+
+
+def create_leads(session, users, platform='facebook'):
+    """Insert leads for {user_id: username} and return them loaded in `session`
+
+    The inserts commit in their own short transaction, in user id order, so
+    concurrent workers never wait on (or deadlock over) each other's
+    uncommitted leads for a whole page transaction. Leads another worker
+    inserted first are loaded instead. SQLite allows a single writer, there
+    they are inserted in `session` itself.
+    """
+    if session.get_bind().dialect.name == 'sqlite':
+        return [
+            _insert_or_get(session, _new_lead(user_id, users[user_id], platform), Lead, platform_user_id=user_id)
+            for user_id in sorted(users)
+        ]
+
+    with Session(bind=session.get_bind()) as own:
+        for user_id in sorted(users):
+            try:
+                with own.begin_nested():
+                    own.add(_new_lead(user_id, users[user_id], platform))
+            except IntegrityError:
+                pass
+        own.commit()
+    return session.query(Lead).filter(Lead.platform_user_id.in_(list(users))).all()
+
+
+def get_or_create_lead(session, user_id, username, platform='facebook'):
+    """Get existing lead or create new one"""
+    lead = session.query(Lead).filter_by(platform_user_id=user_id).first()
+    if not lead:
+        lead = create_leads(session, {user_id: username}, platform)[0]
+    return lead
+
+
+def get_or_create_post(session, post_id, message, created_time, post_url):
+    """Get existing post or create new one"""
+    post = session.query(Post).filter_by(platform_post_id=post_id).first()
+    if not post:
+        post = Post(
+            platform_post_id=post_id,
+            message=message,
+            created_time=parse_time(created_time),
+            post_url=post_url,
+            total_comments=0,
+            total_reactions=0,
+        )
+        post = _insert_or_get(session, post, Post, platform_post_id=post_id)
+    return post
+
+
+# ==============================================================================
+# Counters
+# ==============================================================================
+
+LEAD_COUNTERS = ('total_interactions', 'total_comments', 'total_reactions')
+POST_COUNTERS = ('total_comments', 'total_reactions')
+
+
+class CounterDeltas:
+    """Counter increments collected over a transaction, applied in SQL by apply()
+
+    `total = total + n` never loses increments committed by concurrent workers
+    in the meantime, unlike writing back a value loaded earlier. apply() runs
+    right before commit and updates rows in id order, so the row locks are
+    short and every worker takes them in the same order.
+    """
+
+    def __init__(self):
+        self.leads = defaultdict(Counter)
+        self.posts = defaultdict(Counter)
+
+    def comment(self, post_id, lead_id, n=1):
+        self.posts[post_id]['total_comments'] += n
+        self.leads[lead_id]['total_comments'] += n
+        self.leads[lead_id]['total_interactions'] += n
+
+    def reaction(self, post_id, lead_id, n=1):
+        self.posts[post_id]['total_reactions'] += n
+        self.leads[lead_id]['total_reactions'] += n
+        self.leads[lead_id]['total_interactions'] += n
+
+    def apply(self, session):
+        _increment(session, Lead, LEAD_COUNTERS, self.leads)
+        _increment(session, Post, POST_COUNTERS, self.posts)
+        self.leads.clear()
+        self.posts.clear()
+
+
+def _increment(session, model, columns, deltas):
+    rows = [
+        {'b_id': row_id, **{f'b_{column}': delta[column] for column in columns}}
+        for row_id, delta in sorted(deltas.items()) if any(delta.values())
+    ]
+    if not rows:
+        return
+    table = model.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam('b_id'))
+        .values(**{column: table.c[column] + bindparam(f'b_{column}') for column in columns})
+    )
+    session.execute(stmt, rows)
+
+
+# ==============================================================================
+# Interactions
+# ==============================================================================
+
+def add_comment_if_new(session, post, lead, comment_id, message, created_time, counters):
+    """Add comment if it doesn't exist, counting it in `counters` (CounterDeltas)"""
+    existing = session.query(Comment).filter_by(platform_comment_id=comment_id).first()
+    if existing:
+        return False
+
+    comment = Comment(
+        platform_comment_id=comment_id,
+        message=message,
+        created_time=parse_time(created_time),
+        post_id=post.id,
+        lead_id=lead.id
+    )
+    session.add(comment)
+    session.add(LeadEvent(
+        lead_id=lead.id,
+        post_id=post.id,
+        event_type='comment',
+        occurred_at=comment.created_time or utcnow(),
+        detail=message,
+        platform_ref=comment_id
+    ))
+
+    counters.comment(post.id, lead.id)
+    return True
+
+
+def load_reactions(session, post):
+    """{lead_id: reaction_type} for the reactions stored on `post`"""
+    rows = session.execute(select(Reaction.lead_id, Reaction.reaction_type).where(Reaction.post_id == post.id))
+    return dict(rows.all())
+
+
+def sync_reactions(session, post, stored, fetched, counters):
+    """Apply one page of a post's fetched reactions against its stored ones
+
+    stored: load_reactions() of the post, kept up to date in place
+    fetched: [(lead, reaction_type)]
+    New reactions are inserted and changed types updated with one statement
+    each. New reactions are counted in `counters` (CounterDeltas). Returns
+    (added, changed) as lists of (lead, reaction_type).
+    """
+    now = utcnow()
+    added, changed = [], []
+    new_rows, changed_rows, events = [], [], []
+    for lead, reaction_type in fetched:
+        current = stored.get(lead.id)
+        if current is None:
+            added.append((lead, reaction_type))
+            new_rows.append({'post_id': post.id, 'lead_id': lead.id, 'reaction_type': reaction_type})
+            # The Graph API doesn't timestamp reactions, use when we first saw it
+            events.append({'lead_id': lead.id, 'post_id': post.id, 'event_type': 'reaction',
+                           'occurred_at': now, 'detail': reaction_type})
+            stored[lead.id] = reaction_type
+        elif current != reaction_type:
+            changed.append((lead, reaction_type))
+            changed_rows.append({'b_lead_id': lead.id, 'b_reaction_type': reaction_type})
+            events.append({'lead_id': lead.id, 'post_id': post.id, 'event_type': 'reaction_change',
+                           'occurred_at': now, 'detail': f"{current} -> {reaction_type}"})
+            stored[lead.id] = reaction_type
+
+    if new_rows:
+        session.execute(insert(Reaction), new_rows)
+    if changed_rows:
+        # By (post, lead): reactions inserted earlier in the run have no id cached
+        table = Reaction.__table__
+        session.execute(
+            update(table)
+            .where(table.c.post_id == post.id, table.c.lead_id == bindparam('b_lead_id'))
+            .values(reaction_type=bindparam('b_reaction_type')),
+            changed_rows
+        )
+    if events:
+        session.execute(insert(LeadEvent), events)
+
+    # A changed type is still one reaction
+    for lead, _ in added:
+        counters.reaction(post.id, lead.id)
+    return added, changed
+
+
+def remove_reactions(session, post, stored, seen, counters):
+    """Delete the post's stored reactions whose lead isn't in `seen` any more
+
+    Call once the post's complete reaction set has been fetched. Returns the
+    number of reactions removed.
+    """
+    removed = {lead_id: value for lead_id, value in stored.items() if lead_id not in seen}
+    if not removed:
+        return 0
+
+    session.execute(
+        delete(Reaction).where(Reaction.post_id == post.id, Reaction.lead_id.in_(list(removed)))
+    )
+    now = utcnow()
+    session.execute(insert(LeadEvent), [
+        {'lead_id': lead_id, 'post_id': post.id, 'event_type': 'reaction_removed',
+         'occurred_at': now, 'detail': reaction_type}
+        for lead_id, reaction_type in removed.items()
+    ])
+
+    for lead_id in removed:
+        counters.reaction(post.id, lead_id, -1)
+        del stored[lead_id]
+    return len(removed)
+
+
+class RecordWriter:
+    """Writes one connector's normalized records, caching posts and leads it has seen"""
+
+    def __init__(self, session, platform, tracker=None):
+        self.session = session
+        self.platform = platform
+        self.tracker = tracker  # hot_leads.MomentumTracker fed with every new interaction
+        self.pending_events = []  # (lead_id, weight, at) for the tracker once the page commits
+        self.posts = {}
+        self.leads = {}
+        self.reactions = {}  # post id -> (stored reactions, lead ids seen) until its last reactions page
+        self.counters = CounterDeltas()
+        self.stats = {
+            'posts': 0,
+            'new_comments': 0,
+            'new_reactions': 0,
+            'changed_reactions': 0,
+            'removed_reactions': 0,
+        }
+
+    def post(self, platform_post_id):
+        return self.posts[platform_post_id]
+
+    def lead(self, user_id, username):
+        lead = self.leads.get(user_id)
+        if lead is None:
+            lead = get_or_create_lead(self.session, user_id, username, self.platform)
+            self.leads[user_id] = lead
+        return lead
+
+    def resolve_leads(self, records):
+        """Load or create the leads of `records` with one query for those not cached yet"""
+        missing = {record.user_id: record.username for record in records if record.user_id not in self.leads}
+        if not missing:
+            return
+        for lead in self.session.query(Lead).filter(Lead.platform_user_id.in_(list(missing))):
+            self.leads[lead.platform_user_id] = lead
+        new = {user_id: username for user_id, username in missing.items() if user_id not in self.leads}
+        if new:
+            for lead in create_leads(self.session, new, self.platform):
+                self.leads[lead.platform_user_id] = lead
+
+    def write_posts(self, records):
+        for record in records:
+            self.posts[record.platform_post_id] = get_or_create_post(
+                session=self.session,
+                post_id=record.platform_post_id,
+                message=record.message,
+                created_time=record.created_time,
+                post_url=record.post_url
+            )
+            self.stats['posts'] += 1
+
+    def write_comments(self, records):
+        self.resolve_leads(records)
+        for record in records:
+            lead = self.lead(record.user_id, record.username)
+            if add_comment_if_new(
+                session=self.session,
+                post=self.post(record.post_id),
+                lead=lead,
+                comment_id=record.platform_comment_id,
+                message=record.message,
+                created_time=record.created_time,
+                counters=self.counters
+            ):
+                self.stats['new_comments'] += 1
+                self.pending_events.append((lead.id, event_weight('comment'), parse_time(record.created_time)))
+
+    def _reaction_state(self, post_id):
+        state = self.reactions.get(post_id)
+        if state is None:
+            state = (load_reactions(self.session, self.post(post_id)), set())
+            self.reactions[post_id] = state
+        return state
+
+    def write_reactions(self, records):
+        self.resolve_leads(records)
+        by_post = {}
+        for record in records:
+            by_post.setdefault(record.post_id, []).append((self.leads[record.user_id], record.reaction_type))
+
+        for post_id, fetched in by_post.items():
+            stored, seen = self._reaction_state(post_id)
+            added, changed = sync_reactions(self.session, self.post(post_id), stored, fetched, self.counters)
+            seen.update(lead.id for lead, _ in fetched)
+            self.stats['new_reactions'] += len(added)
+            self.stats['changed_reactions'] += len(changed)
+            for lead, reaction_type in added:
+                self.pending_events.append((lead.id, event_weight('reaction', reaction_type), None))
+            for lead, reaction_type in changed:
+                self.pending_events.append((lead.id, event_weight('reaction_change', reaction_type), None))
+
+    def finish_edge(self, kind, post_id):
+        """Called after the last page of a post's `kind` edge, drops reactions that disappeared"""
+        if kind != 'reactions':
+            return
+        stored, seen = self._reaction_state(post_id)
+        del self.reactions[post_id]
+        self.stats['removed_reactions'] += remove_reactions(
+            self.session, self.post(post_id), stored, seen, self.counters
+        )
+
+    def write(self, kind, records):
+        getattr(self, f'write_{kind}')(records)
+
+    def commit(self):
+        """Apply the pending counter increments, commit and drop cached objects
+
+        Interactions reach the tracker only now, a rolled back page that is
+        retried doesn't count twice.
+        """
+        self.counters.apply(self.session)
+        self.session.commit()
+        if self.tracker is not None:
+            for lead_id, weight, at in self.pending_events:
+                self.tracker.record(lead_id, weight, at)
+        self.pending_events.clear()
+        self.reset_cache()
+
+    def reset_cache(self):
+        """Drop cached objects after a commit so they can be garbage collected"""
+        self.posts.clear()
+        self.leads.clear()
+        self.reactions.clear()
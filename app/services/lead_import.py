@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+"""
+Bulk lead import from CSV or NDJSON streams
+Rows are validated in batches and, on PostgreSQL, COPY'd into a temporary
+staging table that is merged into `leads` on platform_user_id with one
+set-based UPDATE and one INSERT at the end. Other databases (SQLite in
+development) fall back to batched inserts/updates.
+
+Usage: python -m app.services.lead_import leads.csv
+       python -m app.services.lead_import --format ndjson - < leads.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+
+from sqlalchemy import JSON, bindparam, func, insert, select, update
+
+from app import fast_json
+from app.models import Lead, utcnow
+from app.database import get_engine
+
+BATCH_SIZE = 10_000
+MAX_REPORTED_ERRORS = 100
+
+# Importable columns, in staging table order
+IMPORT_COLUMNS = (
+    'platform_user_id',
+    'platform',
+    'username',
+    'user_profile_url',
+    'intent_category',
+    'intent_score',
+    'keywords_matched',
+    'status',
+    'routed',
+)
+
+_TRUE = {'1', 'true', 't', 'yes', 'y'}
+_FALSE = {'0', 'false', 'f', 'no', 'n'}
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+# ==============================================================================
+# Readers
+# ==============================================================================
+
+def iter_csv_rows(stream):
+    """Yield (line_no, dict) from a CSV text stream with a header row"""
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None or 'platform_user_id' not in reader.fieldnames:
+        raise ImportFormatError("CSV header must include platform_user_id")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(stream):
+    """Yield (line_no, dict) from a newline delimited JSON text stream"""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = fast_json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+            continue
+        yield line_no, row
+
+
+READERS = {
+    'csv': iter_csv_rows,
+    'ndjson': iter_ndjson_rows,
+}
+
+
+# ==============================================================================
+# Validation
+# ==============================================================================
+
+def _clean_str(value, max_length=None):
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"expected a string, got {type(value).__name__}")
+    value = str(value).strip()
+    if not value:
+        return None
+    if max_length and len(value) > max_length:
+        raise ValueError(f"longer than {max_length} characters")
+    return value
+
+
+def _clean_float(value):
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _clean_bool(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _clean_keywords(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = json.loads(value) if value.lstrip().startswith('[') else [k.strip() for k in value.split(',') if k.strip()]
+    if not isinstance(value, list):
+        raise ValueError("must be a list")
+    return value
+
+
+def validate_row(row):
+    """Return the row as a tuple in IMPORT_COLUMNS order, raises ValueError or TypeError"""
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object, got {type(row).__name__}")
+
+    platform_user_id = _clean_str(row.get('platform_user_id'), 255)
+    if platform_user_id is None:
+        raise ValueError("platform_user_id is required")
+
+    return (
+        platform_user_id,
+        _clean_str(row.get('platform'), 50),
+        _clean_str(row.get('username'), 255),
+        _clean_str(row.get('user_profile_url')),
+        _clean_str(row.get('intent_category'), 100),
+        _clean_float(row.get('intent_score')),
+        _clean_keywords(row.get('keywords_matched')),
+        _clean_str(row.get('status'), 20),
+        _clean_bool(row.get('routed')),
+    )
+
+
+def validate_batch(batch):
+    """Split [(line_no, row)] into (records, errors)"""
+    records = []
+    errors = []
+    for line_no, row in batch:
+        if isinstance(row, Exception):
+            errors.append((line_no, f"invalid JSON: {row}"))
+            continue
+        try:
+            records.append(validate_row(row))
+        except (TypeError, ValueError) as e:
+            # TypeError: NDJSON values of the wrong type, e.g. {"intent_score": [1]}
+            errors.append((line_no, str(e)))
+    return records, errors
+
+
+def _batches(rows, size):
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ==============================================================================
+# PostgreSQL: COPY into staging + set-based merge
+# ==============================================================================
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE lead_import_staging (
+    seq bigserial,
+    platform_user_id varchar(255) NOT NULL,
+    platform varchar(50),
+    username varchar(255),
+    user_profile_url text,
+    intent_category varchar(100),
+    intent_score double precision,
+    keywords_matched json,
+    status varchar(20),
+    routed boolean
+) ON COMMIT DROP
+"""
+
+_COPY_STAGING = (
+    f"COPY lead_import_staging ({', '.join(IMPORT_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+# The last row wins when a platform_user_id appears more than once
+_DEDUPE_STAGING = """
+CREATE TEMP TABLE lead_import_latest ON COMMIT DROP AS
+SELECT DISTINCT ON (platform_user_id) *
+FROM lead_import_staging
+ORDER BY platform_user_id, seq DESC
+"""
+
+# Columns missing from the import keep their current value
+_UPDATE_EXISTING = """
+UPDATE leads SET
+    platform = COALESCE(s.platform, leads.platform),
+    username = COALESCE(s.username, leads.username),
+    user_profile_url = COALESCE(s.user_profile_url, leads.user_profile_url),
+    intent_category = COALESCE(s.intent_category, leads.intent_category),
+    intent_score = COALESCE(s.intent_score, leads.intent_score),
+    keywords_matched = COALESCE(s.keywords_matched, leads.keywords_matched),
+    status = COALESCE(s.status, leads.status),
+    routed = COALESCE(s.routed, leads.routed),
+    updated_at = now() AT TIME ZONE 'utc'
+FROM lead_import_latest s
+WHERE leads.platform_user_id = s.platform_user_id
+"""
+
+_INSERT_NEW = """
+INSERT INTO leads (
+    platform_user_id, platform, username, user_profile_url, intent_category,
+    intent_score, keywords_matched, status, routed,
+    total_interactions, total_comments, total_reactions, discovered_at, updated_at
+)
+SELECT
+    s.platform_user_id, COALESCE(s.platform, 'facebook'), s.username, s.user_profile_url, s.intent_category,
+    s.intent_score, s.keywords_matched, COALESCE(s.status, 'new'), COALESCE(s.routed, false),
+    0, 0, 0, now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+FROM lead_import_latest s
+WHERE NOT EXISTS (SELECT 1 FROM leads WHERE leads.platform_user_id = s.platform_user_id)
+ON CONFLICT (platform_user_id) DO NOTHING
+"""
+
+
+def _copy_batch(cursor, records):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        row = list(record)
+        if row[6] is not None:
+            row[6] = json.dumps(row[6])
+        writer.writerow(row)
+    buffer.seek(0)
+    cursor.copy_expert(_COPY_STAGING, buffer)
+
+
+def _load_postgresql(connection, batches):
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(_CREATE_STAGING)
+        for records in batches:
+            if records:
+                _copy_batch(cursor, records)
+        cursor.execute(_DEDUPE_STAGING)
+        cursor.execute(_UPDATE_EXISTING)
+        updated = cursor.rowcount
+        cursor.execute(_INSERT_NEW)
+        inserted = cursor.rowcount
+    finally:
+        cursor.close()
+    return inserted, updated
+
+
+# ==============================================================================
+# Fallback: batched inserts/updates (SQLite and other databases)
+# ==============================================================================
+
+def _param(column):
+    """Bind parameter for an import column, None is SQL NULL (JSON 'null' would beat COALESCE)"""
+    type_ = Lead.__table__.c[column].type
+    if isinstance(type_, JSON):
+        type_ = JSON(none_as_null=True)
+    return bindparam(f'b_{column}', type_=type_)
+
+
+def _load_batched(connection, batches):
+    table = Lead.__table__
+    insert_new = insert(table).values({column: _param(column) for column in IMPORT_COLUMNS})
+    update_existing = (
+        update(table)
+        .where(table.c.platform_user_id == bindparam('b_platform_user_id'))
+        .values({column: func.coalesce(_param(column), table.c[column]) for column in IMPORT_COLUMNS[1:]})
+        .values(updated_at=utcnow())
+    )
+    inserted = updated = 0
+
+    for records in batches:
+        if not records:
+            continue
+        # Last occurrence wins within a batch, like the PostgreSQL merge
+        by_user = {record[0]: dict(zip(IMPORT_COLUMNS, record)) for record in records}
+        existing = set(connection.scalars(
+            select(table.c.platform_user_id).where(table.c.platform_user_id.in_(list(by_user)))
+        ))
+
+        new_rows = []
+        changed_rows = []
+        for platform_user_id, row in by_user.items():
+            if platform_user_id in existing:
+                changed_rows.append({f'b_{column}': value for column, value in row.items()})
+            else:
+                row['platform'] = row['platform'] or 'facebook'
+                row['status'] = row['status'] or 'new'
+                row['routed'] = bool(row['routed'])
+                new_rows.append({f'b_{column}': value for column, value in row.items()})
+
+        if new_rows:
+            connection.execute(insert_new, new_rows)
+        if changed_rows:
+            connection.execute(update_existing, changed_rows)
+        inserted += len(new_rows)
+        updated += len(changed_rows)
+
+    return inserted, updated
+
+
+# ==============================================================================
+# Entry points
+# ==============================================================================
+
+def import_leads(stream, fmt='csv', batch_size=BATCH_SIZE, engine=None):
+    """Import leads from a text stream in one transaction, return stats"""
+    if fmt not in READERS:
+        raise ImportFormatError(f"Unsupported format: {fmt}")
+
+    engine = engine or get_engine()
+    stats = {
+        'rows': 0,
+        'valid': 0,
+        'inserted': 0,
+        'updated': 0,
+        'invalid': 0,
+        'errors': [],
+    }
+
+    def validated_batches():
+        for batch in _batches(READERS[fmt](stream), batch_size):
+            records, errors = validate_batch(batch)
+            stats['rows'] += len(batch)
+            stats['valid'] += len(records)
+            stats['invalid'] += len(errors)
+            remaining = MAX_REPORTED_ERRORS - len(stats['errors'])
+            if remaining > 0:
+                stats['errors'].extend(
+                    {'line': line_no, 'error': message} for line_no, message in errors[:remaining]
+                )
+            yield records
+
+    try:
+        with engine.begin() as connection:
+            if connection.dialect.name == 'postgresql':
+                inserted, updated = _load_postgresql(connection, validated_batches())
+            else:
+                inserted, updated = _load_batched(connection, validated_batches())
+    except UnicodeDecodeError as e:
+        # The stream is decoded as it's read, nothing has been committed
+        raise ImportFormatError(f"Input is not valid UTF-8: {e}")
+
+    stats['inserted'] = inserted
+    stats['updated'] = updated
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import leads from CSV or NDJSON")
+    parser.add_argument("path", help="file to import, - for stdin")
+    parser.add_argument("--format", choices=sorted(READERS), help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('ndjson' if args.path.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    try:
+        if args.path == '-':
+            stats = import_leads(sys.stdin, fmt, args.batch_size)
+        else:
+            with open(args.path, newline='', encoding='utf-8') as stream:
+                stats = import_leads(stream, fmt, args.batch_size)
+    except ImportFormatError as e:
+        print(f"❌ Error: {str(e)}")
+        return 1
+
+    print(f"✓ Imported {stats['valid']} of {stats['rows']} rows "
+          f"({stats['inserted']} new, {stats['updated']} updated, {stats['invalid']} invalid)")
+    for error in stats['errors']:
+        print(f"  line {error['line']}: {error['error']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Read queries behind the dashboard views and the JSON leads API
+Take a session from app.services.read_routing.read_session()
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+
+from app.models import Lead, LeadEvent
+
+
+@dataclass
+class LeadPage:
+    """The part of Flask-SQLAlchemy's Pagination used by partials/_lead_row.html"""
+    items: list
+    page: int
+    has_next: bool
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+
+# Lead.to_dict(include_interactions=False) keys, in the same order
+LEAD_API_COLUMNS = (
+    'id',
+    'platform_user_id',
+    'platform',
+    'username',
+    'user_profile_url',
+    'intent_category',
+    'intent_score',
+    'keywords_matched',
+    'total_interactions',
+    'total_comments',
+    'total_reactions',
+    'hot_score',
+    'status',
+    'routed',
+    'discovered_at',
+    'updated_at',
+)
+
+
+def _leads_query(platform, *columns):
+    query = select(*columns or (Lead,)).order_by(Lead.id)
+    if platform and platform != 'all':
+        query = query.where(Lead.platform == platform)
+    return query
+
+
+def fetch_leads_page(session, platform, page, per_page=20):
+    """One page of leads, fetching a single extra row to know if there is a next page"""
+    page = max(page, 1)
+    query = _leads_query(platform).offset((page - 1) * per_page).limit(per_page + 1)
+    leads = session.scalars(query).all()
+    return LeadPage(items=leads[:per_page], page=page, has_next=len(leads) > per_page)
+
+
+def fetch_leads_after(session, platform, after_id, limit):
+    """Keyset page of leads with id > after_id, as plain LEAD_API_COLUMNS dicts"""
+    columns = [Lead.__table__.c[name] for name in LEAD_API_COLUMNS]
+    query = _leads_query(platform, *columns).where(Lead.id > after_id).limit(limit)
+    return [dict(row) for row in session.execute(query).mappings()]
+
+
+def fetch_hot_leads(session, platform, limit=50):
+    """Leads with the most recent momentum first"""
+    query = select(Lead).where(Lead.hot_score > 0)
+    if platform and platform != 'all':
+        query = query.where(Lead.platform == platform)
+    query = query.order_by(Lead.hot_score.desc(), Lead.id).limit(limit)
+    return session.scalars(query).all()
+
+
+def encode_event_cursor(event):
+    return f"{event.occurred_at.isoformat()}|{event.id}"
+
+
+def decode_event_cursor(cursor):
+    """(occurred_at, id) from encode_event_cursor(), None if missing or malformed"""
+    try:
+        # An unencoded '+' in the UTC offset arrives as a space
+        occurred_at, event_id = cursor.replace(' ', '+').rsplit('|', 1)
+        return datetime.fromisoformat(occurred_at), int(event_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def fetch_lead_timeline(session, lead_id, cursor=None, limit=50):
+    """Newest-first page of a lead's events and the cursor for the next page
+
+    Keyset paginated on (occurred_at, id), served by ix_lead_events_lead_id_occurred_at
+    """
+    query = select(LeadEvent).where(LeadEvent.lead_id == lead_id)
+    position = decode_event_cursor(cursor)
+    if position:
+        query = query.where(tuple_(LeadEvent.occurred_at, LeadEvent.id) < tuple_(*position))
+    query = query.order_by(LeadEvent.occurred_at.desc(), LeadEvent.id.desc()).limit(limit + 1)
+
+    events = session.scalars(query).all()
+    next_cursor = encode_event_cursor(events[limit - 1]) if len(events) > limit else None
+    return events[:limit], next_cursor
@@ -0,0 +1,203 @@
+"""
+Opt-in profiling for extraction runs
+Enable per run with EXTRACT_PROFILE=sample|cprofile or the --profile flag of
+the extraction CLIs. Time is attributed to stages marked with stage():
+
+    rate_limit  waiting for the connector's rate budget
+    http        waiting on the Graph API
+    json        decoding response bodies
+    normalize   Graph payloads to records
+    db          ORM writes and commits
+
+`sample` (default) is a low-overhead wall-clock sampler covering every thread.
+It writes collapsed stacks (<run>.collapsed, one "stage;frame;...;frame count"
+per line, for flamegraph.pl or speedscope) and a top-N report per stage.
+`cprofile` runs cProfile in the calling thread only, one profile per stage,
+and writes a .prof file per stage plus the same report. The connector runner
+runs the accounts one after another in its own thread for it.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from app.config import Config
+
+MODES = ('sample', 'cprofile')
+
+_NO_STAGE = nullcontext()
+_active = None  # Running profiler, None when profiling is off
+
+
+def stage(name):
+    """Attribute the enclosed work to `name`, free when profiling is off"""
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name)
+
+
+class SamplingProfiler:
+    """Samples every thread's stack every `interval` seconds"""
+
+    calling_thread_only = False
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()  # (stage, stack) -> count
+        self._stages = defaultdict(list)  # thread id -> stage stack
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+
+    @contextmanager
+    def stage(self, name):
+        stack = self._stages[threading.get_ident()]
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stages = self._stages.get(thread_id)
+                stage_name = stages[-1] if stages else 'other'
+                self.samples[(stage_name, _collapse(frame))] += 1
+
+    def write(self, path_prefix, top):
+        collapsed_path = f"{path_prefix}.collapsed"
+        with open(collapsed_path, 'w') as f:
+            for (stage_name, stack), count in self.samples.most_common():
+                f.write(f"{stage_name};{stack} {count}\n")
+
+        total = sum(self.samples.values()) or 1
+        by_stage = Counter()
+        self_time = defaultdict(Counter)
+        for (stage_name, stack), count in self.samples.items():
+            by_stage[stage_name] += count
+            self_time[stage_name][stack.rsplit(';', 1)[-1]] += count
+
+        out = io.StringIO()
+        out.write(f"Sampled every {self.interval * 1000:.1f} ms, {total} samples\n")
+        for stage_name, count in by_stage.most_common():
+            out.write(f"\n== {stage_name}: {count} samples ({count / total:.1%}) ==\n")
+            for function, samples in self_time[stage_name].most_common(top):
+                out.write(f"{samples:8d} {samples / total:7.1%}  {function}\n")
+
+        report_path = f"{path_prefix}.report.txt"
+        with open(report_path, 'w') as f:
+            f.write(out.getvalue())
+        return [collapsed_path, report_path]
+
+
+class StageCProfiler:
+    """cProfile with one profile per stage, calling thread only"""
+
+    calling_thread_only = True
+
+    def __init__(self):
+        self.profiles = defaultdict(cProfile.Profile)
+        self._stack = []
+        self._thread_id = threading.get_ident()
+
+    @contextmanager
+    def stage(self, name):
+        # cProfile only sees the thread that enabled it
+        if threading.get_ident() != self._thread_id:
+            yield
+            return
+        self._switch(self._stack[-1] if self._stack else None, name)
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self._switch(name, self._stack[-1] if self._stack else 'other')
+
+    def _switch(self, current, new):
+        self.profiles[current or 'other'].disable()
+        self.profiles[new].enable()
+
+    def start(self):
+        self.profiles['other'].enable()
+
+    def stop(self):
+        for profile in self.profiles.values():
+            profile.disable()
+
+    def write(self, path_prefix, top):
+        paths = []
+        out = io.StringIO()
+        for stage_name, profile in self.profiles.items():
+            path = f"{path_prefix}.{stage_name}.prof"
+            profile.dump_stats(path)
+            paths.append(path)
+
+            stats = pstats.Stats(profile, stream=out)
+            out.write(f"\n== {stage_name}: {stats.total_tt:.3f} s ==\n")
+            stats.sort_stats('tottime').print_stats(top)
+
+        report_path = f"{path_prefix}.report.txt"
+        with open(report_path, 'w') as f:
+            f.write(out.getvalue())
+        return paths + [report_path]
+
+
+def _collapse(frame):
+    """root;...;leaf stack of `frame` as 'module:function' entries"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+@contextmanager
+def profile_run(name, mode=None, output_dir=None, top=25):
+    """Profile the enclosed run when `mode` (or EXTRACT_PROFILE) is set"""
+    global _active
+
+    mode = (mode or Config.EXTRACT_PROFILE or '').strip().lower()
+    if mode in ('', '0', 'false', 'no', 'off'):
+        yield None
+        return
+    if mode in ('1', 'true', 'yes', 'on'):
+        mode = 'sample'
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiling mode: {mode} (expected one of {', '.join(MODES)})")
+
+    profiler = SamplingProfiler() if mode == 'sample' else StageCProfiler()
+    output_dir = output_dir or Config.EXTRACT_PROFILE_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    path_prefix = os.path.join(output_dir, f"{name}-{datetime.now():%Y%m%d-%H%M%S}")
+
+    _active = profiler
+    started = time.perf_counter()
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active = None
+        paths = profiler.write(path_prefix, top)
+        print(f"Profiled {name} ({mode}) in {time.perf_counter() - started:.1f} s:")
+        for path in paths:
+            print(f"  {path}")
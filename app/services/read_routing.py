@@ -0,0 +1,39 @@
+"""
+Read-replica routing for the dashboard
+Read-only views and exports read from READ_DATABASE_URL when it is set, so
+big ingestion transactions on the primary don't slow the dashboard down.
+
+Replicas lag, so a user who just wrote something (any successful POST, PUT,
+PATCH or DELETE) reads from the primary for READ_YOUR_WRITES_SECONDS
+afterwards and always sees their own changes.
+"""
+
+import time
+
+from flask import request, session
+
+from app.config import Config
+from app.database import get_read_session_factory
+
+WRITE_METHODS = frozenset(('POST', 'PUT', 'PATCH', 'DELETE'))
+
+
+def record_write(response):
+    """after_request hook, remembers when this user last wrote something"""
+    if request.method in WRITE_METHODS and response.status_code < 400 and 'user_id' in session:
+        session['last_write_at'] = time.time()
+    return response
+
+
+def use_replica():
+    """True if this request's reads can go to the replica"""
+    if not Config.READ_DATABASE_URL:
+        return False
+    last_write_at = session.get('last_write_at')
+    return last_write_at is None or time.time() - last_write_at > Config.READ_YOUR_WRITES_SECONDS
+
+
+def read_session():
+    """New session for a read-only view, close it when done"""
+    return get_read_session_factory(use_replica())()
+
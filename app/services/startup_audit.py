@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Startup-time audit for the web app and the CLI tools
+Runs each entry point under `python -X importtime` in a fresh interpreter and
+reports the slowest imports, the total import time and any module that entry
+point is not supposed to load.
+
+Usage: python -m app.services.startup_audit [--check] [--top 15] [entry ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# entry point -> (module imported, import-time budget in ms, modules it must not load)
+ENTRY_POINTS = {
+    "web": ("run", 900, ("requests", "app.services.facebook_leads", "flask_migrate")),
+    "extractor": ("app.services.facebook_leads", 700, ("app.routes", "flask_migrate")),
+    "create_user": ("app.services.create_user", 600, ("requests", "app.routes", "flask_migrate")),
+}
+
+
+def measure_imports(module):
+    """Import `module` in a clean interpreter and return [(name, self_us, cumulative_us)]"""
+    env = dict(os.environ)
+    # The web entry point builds the app, skip Migrate like production workers do
+    env.setdefault("LOAD_MIGRATIONS", "false")
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT_DIR,
+    )
+    if proc.returncode != 0:
+        raise Exception(f"Importing {module} failed:\n{proc.stderr}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def audit(entry, top=15, budget_slack=1.0):
+    """Print a report for one entry point, return a list of problems
+
+    budget_slack scales the import-time budget, e.g. for slow CI machines
+    """
+    module, budget_ms, forbidden = ENTRY_POINTS[entry]
+    budget_ms *= budget_slack
+    rows = measure_imports(module)
+    loaded = {name for name, _, _ in rows}
+    total_ms = sum(self_us for _, self_us, _ in rows) / 1000
+
+    print(f"\n{'='*60}")
+    print(f"{entry}: import {module}")
+    print(f"Total import time: {total_ms:.1f} ms (budget {budget_ms:.0f} ms), {len(rows)} modules")
+    print(f"{'='*60}")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+    problems = []
+    if total_ms > budget_ms:
+        problems.append(f"{entry}: {total_ms:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+    for name in forbidden:
+        if name in loaded:
+            problems.append(f"{entry}: imports {name}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time of the app entry points")
+    parser.add_argument("entries", nargs="*", metavar="entry",
+                        help=f"entry points to audit: {', '.join(ENTRY_POINTS)} (default: all)")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--check", action="store_true", help="exit non-zero when a budget is exceeded")
+    args = parser.parse_args(argv)
+    for entry in args.entries:
+        if entry not in ENTRY_POINTS:
+            parser.error(f"unknown entry point: {entry}")
+
+    problems = []
+    for entry in args.entries or ENTRY_POINTS:
+        problems.extend(audit(entry, top=args.top))
+
+    if problems:
+        print("\n❌ Startup audit problems:")
+        for problem in problems:
+            print(f"  - {problem}")
+    else:
+        print("\n✓ All entry points within budget")
+
+    return 1 if problems and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Streaming reads for large scans
+Runs a statement on a server-side cursor (psycopg2 named cursor) and yields
+plain rows in fixed-size batches, so memory stays flat no matter how many
+rows match and no ORM objects are built. Use for read-only paths only.
+"""
+
+from datetime import date, datetime
+
+DEFAULT_BATCH_SIZE = 2000
+
+
+def stream_rows(session, stmt, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield Row tuples for `stmt`, fetching `batch_size` rows per round trip"""
+    for batch in stream_batches(session, stmt, batch_size):
+        yield from batch
+
+
+def stream_batches(session, stmt, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield lists of Row tuples of at most `batch_size` rows"""
+    result = session.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def row_to_dict(row):
+    """JSON friendly dict of a Row, dates as ISO strings"""
+    return {
+        key: value.isoformat() if isinstance(value, (datetime, date)) else value
+        for key, value in row._mapping.items()
+    }
@@ -0,0 +1,60 @@
+"""
+Production serving config
+Usage: gunicorn -c gunicorn.conf.py run:app
+
+run.py's app.run() is the Flask dev server, only use it for local development.
+
+Sizing
+------
+Each worker is a process with its own connection pool, each thread serves one
+request at a time:
+
+    concurrent requests = WEB_WORKERS * WEB_THREADS
+
+- WEB_WORKERS defaults to 2 * CPUs + 1, lower it if memory is tight.
+- WEB_THREADS defaults to 8. Slow requests (CSV exports, the dashboard
+  aggregates) only tie up the thread serving them, the other threads keep
+  serving the dashboard while an export runs. Exports and the read views can
+  also be moved off the primary with READ_DATABASE_URL.
+- Keep DB_POOL_SIZE + DB_MAX_OVERFLOW >= WEB_THREADS so no thread waits on the
+  pool, and WEB_WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres'
+  max_connections (or put PgBouncer in front and set DB_PGBOUNCER=true).
+"""
+
+import multiprocessing
+import os
+
+# Web workers don't need Flask-Migrate, must be set before the app is imported
+os.environ.setdefault("LOAD_MIGRATIONS", "false")
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:8000")
+worker_class = "gthread"
+workers = int(os.getenv("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("WEB_THREADS", 8))
+
+# Large exports can take a while to stream
+timeout = int(os.getenv("WEB_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap memory growth
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", 2000))
+max_requests_jitter = 200
+
+# Load the app once in the master and fork it, workers share the imported code
+preload_app = True
+
+certfile = os.getenv("WEB_CERTFILE")
+keyfile = os.getenv("WEB_KEYFILE")
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Never share pooled connections with the master process
+    from app.config import Config
+    from app.database import get_engine
+    get_engine().dispose(close=False)
+    if Config.READ_DATABASE_URL:
+        get_engine(Config.READ_DATABASE_URL).dispose(close=False)
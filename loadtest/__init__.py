@@ -0,0 +1,12 @@
+"""
+Load testing for the dashboard endpoints
+
+    python -m loadtest.seed --leads 50000                        # realistic data set in DATABASE_URL
+    FRAGMENT_CACHE_SIZE=0 gunicorn -c gunicorn.conf.py run:app   # the server under test
+    python -m loadtest.driver --base-url http://127.0.0.1:8000 --save-baseline main
+    python -m loadtest.driver --base-url http://127.0.0.1:8000 --compare main
+
+Baselines depend on the machine, data set and server settings, record them on
+the box that runs the comparison with the same FRAGMENT_CACHE_SIZE. See
+loadtest.seed and loadtest.driver for details.
+"""
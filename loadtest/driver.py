@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+"""
+Load driver for the dashboard endpoints
+Logs in, then hammers each endpoint in turn with --concurrency parallel
+clients for --duration seconds and reports p50/p95/p99 latency, throughput
+and errors per endpoint and concurrency level. Run it against a server
+started the way production runs it (gunicorn -c gunicorn.conf.py run:app)
+on a database seeded with loadtest.seed.
+
+Requests never send If-None-Match, so every response is fully served. The
+rendered-fragment cache still applies, and `index` and `leads-data` only
+have about a hundred distinct URLs, which all fit in it: with the default
+FRAGMENT_CACHE_SIZE those endpoints measure cache hits, not rendering. Start
+the server with FRAGMENT_CACHE_SIZE=0 for baselines that should catch view
+and query regressions.
+
+Baselines are JSON files under loadtest/baselines/. --compare fails (exit
+status 1) when an endpoint's p95 grew, or its throughput dropped, by more
+than --tolerance against the baseline, so it can gate view changes.
+
+Usage: python -m loadtest.driver --base-url http://127.0.0.1:8000
+           [--concurrency 1,8,32] [--duration 20] [--endpoint leads-data ...]
+           [--save-baseline NAME] [--compare NAME] [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+LEAD_SAMPLE_SIZE = 500
+
+
+# name -> function(rng, lead_ids) returning the path to request
+ENDPOINTS = {
+    'index': lambda rng, lead_ids: '/',
+    'leads-data': lambda rng, lead_ids: f"/leads-data?page={rng.randint(1, 50)}&platform={rng.choice(['all', 'facebook'])}",
+    'lead': lambda rng, lead_ids: f"/lead/{rng.choice(lead_ids)}",
+    'lead-timeline': lambda rng, lead_ids: f"/lead/{rng.choice(lead_ids)}/timeline",
+    'api-leads': lambda rng, lead_ids: f"/api/leads?after_id={rng.choice(lead_ids)}&limit=100",
+    'export': lambda rng, lead_ids: "/leads/export?export_type=all",
+}
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def login(base_url, email, password, verify=True):
+    """Session cookies of a logged-in user"""
+    http = requests.Session()
+    http.verify = verify
+    response = http.post(f"{base_url}/login", json={'email': email, 'password': password})
+    if response.status_code != 200:
+        raise SystemExit(f"❌ Login failed ({response.status_code}), seed a user with loadtest.seed")
+    return http.cookies
+
+
+def sample_lead_ids(base_url, cookies, verify=True):
+    """Lead ids spread over the whole table, through the keyset JSON API
+
+    Walks every page once and keeps a uniform (reservoir) sample, so big
+    tables don't bias the sample towards the oldest ids.
+    """
+    rng = random.Random(0)
+    sample, seen, after_id = [], 0, 0
+    while after_id is not None:
+        response = requests.get(f"{base_url}/api/leads", params={'after_id': after_id, 'limit': 500},
+                                cookies=cookies, verify=verify)
+        response.raise_for_status()
+        payload = response.json()
+        for lead in payload['leads']:
+            seen += 1
+            if len(sample) < LEAD_SAMPLE_SIZE:
+                sample.append(lead['id'])
+            else:
+                slot = rng.randrange(seen)
+                if slot < LEAD_SAMPLE_SIZE:
+                    sample[slot] = lead['id']
+        after_id = payload['next_after_id']
+    if not sample:
+        raise SystemExit("❌ No leads found, seed the database with loadtest.seed")
+    return sample
+
+
+def run_endpoint(base_url, cookies, name, lead_ids, concurrency, duration, verify=True):
+    """Drive one endpoint, returns its stats"""
+    make_path = ENDPOINTS[name]
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(worker):
+        rng = random.Random(worker)
+        http = requests.Session()
+        http.verify = verify
+        http.cookies.update(cookies)
+        own_latencies, own_errors = [], []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = http.get(base_url + make_path(rng, lead_ids), allow_redirects=False)
+                response.content  # Read the whole body, exports stream
+                if response.status_code != 200:
+                    own_errors.append(response.status_code)
+                    continue
+            except requests.RequestException as e:
+                own_errors.append(type(e).__name__)
+                continue
+            own_latencies.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own_latencies)
+            errors.extend(own_errors)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'endpoint': name,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_kinds': sorted({str(error) for error in errors}),
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'max_ms': _ms(latencies[-1] if latencies else None),
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def print_report(results):
+    print(f"\n{'endpoint':<16}{'conc':>5}{'reqs':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        print(f"{result['endpoint']:<16}{result['concurrency']:>5}{result['requests']:>8}{result['errors']:>6}"
+              f"{result['throughput_rps']:>10.1f}{_fmt(result['p50_ms'])}{_fmt(result['p95_ms'])}{_fmt(result['p99_ms'])}")
+
+
+def _fmt(value):
+    return f"{value:>10.1f}" if value is not None else f"{'-':>10}"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_baseline(name, results, settings):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    with open(path, 'w') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'settings': settings,
+            'results': results,
+        }, f, indent=2)
+        f.write('\n')
+    return path
+
+
+def compare(name, results, tolerance):
+    """Print the changes against baseline `name`, returns the regressions"""
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    with open(path) as f:
+        baseline = {(r['endpoint'], r['concurrency']): r for r in json.load(f)['results']}
+
+    regressions = []
+    print(f"\nAgainst baseline '{name}' (tolerance {tolerance:.0%}):")
+    for result in results:
+        before = baseline.get((result['endpoint'], result['concurrency']))
+        if before is None or not before['p95_ms'] or not result['p95_ms']:
+            continue
+        p95_change = result['p95_ms'] / before['p95_ms'] - 1
+        rps_change = result['throughput_rps'] / before['throughput_rps'] - 1 if before['throughput_rps'] else 0
+        regressed = p95_change > tolerance or rps_change < -tolerance or result['errors'] > before['errors']
+        label = f"{result['endpoint']}@{result['concurrency']}"
+        print(f"{'❌' if regressed else '✓'} {label:<22} p95 {p95_change:+.0%}  throughput {rps_change:+.0%}"
+              f"  errors {before['errors']} -> {result['errors']}")
+        if regressed:
+            regressions.append(label)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the dashboard endpoints")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="loadtest@example.com")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINTS),
+                        help="endpoint to drive, repeatable (default: all)")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma separated client counts")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per endpoint and concurrency")
+    parser.add_argument("--insecure", action="store_true", help="don't verify TLS (self-signed cert.pem)")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput change")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    verify = not args.insecure
+    levels = [int(level) for level in args.concurrency.split(',')]
+    endpoints = args.endpoint or list(ENDPOINTS)
+
+    cookies = login(base_url, args.email, args.password, verify)
+    lead_ids = sample_lead_ids(base_url, cookies, verify)
+
+    results = []
+    for name in endpoints:
+        for concurrency in levels:
+            print(f"→ {name} with {concurrency} clients for {args.duration:g} s")
+            results.append(run_endpoint(base_url, cookies, name, lead_ids, concurrency, args.duration, verify))
+    print_report(results)
+
+    if args.save_baseline:
+        settings = {'base_url': base_url, 'duration': args.duration, 'concurrency': levels}
+        print(f"\n✓ Baseline saved to {save_baseline(args.save_baseline, results, settings)}")
+
+    if args.compare:
+        regressions = compare(args.compare, results, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            raise SystemExit(1)
+        print("\n✓ No regressions")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Load-test data generator
+Seeds DATABASE_URL with N leads whose activity looks like a real Page's:
+most leads interact once or twice, a long tail interacts a lot (Pareto
+distributed), LIKE dominates the reaction types, activity is spread over the
+last 90 days (never in the future) and skewed towards recent posts.
+Comments, reactions, lead events and the lead/post counters are all
+consistent with each other.
+
+Generation is deterministic for a given --seed, so baselines are comparable.
+Seeded rows are prefixed with `lt-` and removed again with --reset.
+
+Usage: python -m loadtest.seed [--leads 50000] [--posts 500] [--seed 42] [--reset]
+"""
+
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app.database import get_engine
+from app.models import Lead, Post, Comment, Reaction, LeadEvent, utcnow
+from app.services.create_user import create_user
+
+PREFIX = 'lt-'
+BATCH_SIZE = 5000
+HISTORY_DAYS = 90
+
+PLATFORMS = [('facebook', 0.8), ('instagram', 0.2)]
+REACTION_TYPES = [('LIKE', 0.70), ('LOVE', 0.15), ('HAHA', 0.05), ('WOW', 0.04), ('CARE', 0.03), ('SAD', 0.02), ('ANGRY', 0.01)]
+STATUSES = [('new', 0.7), ('contacted', 0.2), ('qualified', 0.07), ('lost', 0.03)]
+COMMENTS = [
+    "How much is this?",
+    "Is this still available?",
+    "Do you ship to my city?",
+    "Interested, sent you a message",
+    "Love it!",
+    "What sizes do you have?",
+    "Great post",
+    "Price please",
+]
+
+
+def _pick(rng, weighted):
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def _activity_count(rng, cap):
+    """Interactions of one kind for one lead: mostly 0-2, a long tail of heavy users"""
+    return min(int(rng.paretovariate(1.6)) - 1, cap)
+
+
+def _batched(rows, size=BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def reset(engine):
+    """Delete every seeded row"""
+    with engine.begin() as conn:
+        lead_ids = select(Lead.id).where(Lead.platform_user_id.like(f'{PREFIX}%')).scalar_subquery()
+        post_ids = select(Post.id).where(Post.platform_post_id.like(f'{PREFIX}%')).scalar_subquery()
+        for model in (LeadEvent, Comment, Reaction):
+            conn.execute(delete(model).where(model.lead_id.in_(lead_ids) | model.post_id.in_(post_ids)))
+        conn.execute(delete(Lead).where(Lead.platform_user_id.like(f'{PREFIX}%')))
+        conn.execute(delete(Post).where(Post.platform_post_id.like(f'{PREFIX}%')))
+
+
+def _insert_ids(conn, model, key, rows):
+    """Insert `rows` in batches and return {key value: id}"""
+    ids = {}
+    key_column = getattr(model, key)
+    for batch in _batched(rows):
+        conn.execute(insert(model), batch)
+        keys = [row[key] for row in batch]
+        ids.update((k, i) for k, i in conn.execute(select(key_column, model.id).where(key_column.in_(keys))))
+    return ids
+
+
+def generate(n_leads, n_posts, seed_value=42):
+    """Posts, leads and their interactions, interactions reference posts/leads by key"""
+    rng = random.Random(seed_value)
+    now = utcnow()
+
+    # Newer posts get more engagement
+    post_times = sorted(now - timedelta(days=rng.uniform(0, HISTORY_DAYS)) for _ in range(n_posts))
+    post_weights = [1 + 4 * i / max(n_posts - 1, 1) for i in range(n_posts)]
+    posts = [
+        {
+            'platform_post_id': f'{PREFIX}post-{i}',
+            'message': f'Load test post {i}',
+            'created_time': created_time,
+            'post_url': f'https://example.com/posts/{i}',
+            'total_comments': 0,
+            'total_reactions': 0,
+        }
+        for i, created_time in enumerate(post_times)
+    ]
+    post_keys = [post['platform_post_id'] for post in posts]
+    posts_by_key = dict(zip(post_keys, posts))
+
+    leads, comments, reactions = [], [], []
+    for i in range(n_leads):
+        intent = rng.random() < 0.3
+        lead = {
+            'platform_user_id': f'{PREFIX}user-{i}',
+            'platform': _pick(rng, PLATFORMS),
+            'username': f'Load Test User {i}',
+            'intent_category': 'purchase' if intent else None,
+            'intent_score': round(rng.uniform(0.4, 1.0), 2) if intent else None,
+            'keywords_matched': ['price', 'available'] if intent else None,
+            'total_interactions': 0,
+            'total_comments': 0,
+            'total_reactions': 0,
+            'status': _pick(rng, STATUSES),
+            'routed': rng.random() < 0.4,
+            'discovered_at': now - timedelta(days=rng.uniform(0, HISTORY_DAYS)),
+        }
+        leads.append(lead)
+
+        for n in range(_activity_count(rng, 200)):
+            post = posts_by_key[rng.choices(post_keys, post_weights)[0]]
+            comments.append({
+                'platform_comment_id': f"{lead['platform_user_id']}-c{n}",
+                'message': rng.choice(COMMENTS),
+                'created_time': min(post['created_time'] + timedelta(hours=rng.expovariate(1 / 24)), now),
+                'post': post['platform_post_id'],
+                'lead': lead['platform_user_id'],
+                'intent_score': lead['intent_score'],
+            })
+            post['total_comments'] += 1
+            lead['total_comments'] += 1
+
+        # One reaction per (post, lead), every lead interacted at least once
+        n_reactions = min(_activity_count(rng, 200) + (0 if lead['total_comments'] else 1), n_posts)
+        for post_key in dict.fromkeys(rng.choices(post_keys, post_weights, k=n_reactions)):
+            post = posts_by_key[post_key]
+            reactions.append({
+                'reaction_type': _pick(rng, REACTION_TYPES),
+                'discovered_at': min(post['created_time'] + timedelta(hours=rng.expovariate(1 / 12)), now),
+                'post': post_key,
+                'lead': lead['platform_user_id'],
+            })
+            post['total_reactions'] += 1
+            lead['total_reactions'] += 1
+
+        lead['total_interactions'] = lead['total_comments'] + lead['total_reactions']
+
+    return posts, leads, comments, reactions
+
+
+def seed(n_leads, n_posts, seed_value=42, engine=None):
+    """Generate and insert the data set, returns row counts per table"""
+    engine = engine or get_engine()
+    posts, leads, comments, reactions = generate(n_leads, n_posts, seed_value)
+
+    with engine.begin() as conn:
+        post_ids = _insert_ids(conn, Post, 'platform_post_id', posts)
+        lead_ids = _insert_ids(conn, Lead, 'platform_user_id', leads)
+
+        events = []
+        for comment in comments:
+            comment['post_id'] = post_ids[comment.pop('post')]
+            comment['lead_id'] = lead_ids[comment.pop('lead')]
+            events.append({
+                'lead_id': comment['lead_id'], 'post_id': comment['post_id'], 'event_type': 'comment',
+                'occurred_at': comment['created_time'], 'detail': comment['message'],
+                'platform_ref': comment['platform_comment_id'],
+            })
+        for reaction in reactions:
+            reaction['post_id'] = post_ids[reaction.pop('post')]
+            reaction['lead_id'] = lead_ids[reaction.pop('lead')]
+            events.append({
+                'lead_id': reaction['lead_id'], 'post_id': reaction['post_id'], 'event_type': 'reaction',
+                'occurred_at': reaction['discovered_at'], 'detail': reaction['reaction_type'],
+                'platform_ref': None,
+            })
+
+        for model, rows in ((Comment, comments), (Reaction, reactions), (LeadEvent, events)):
+            for batch in _batched(rows):
+                conn.execute(insert(model), batch)
+
+    return {
+        'posts': len(posts),
+        'leads': len(leads),
+        'comments': len(comments),
+        'reactions': len(reactions),
+        'lead_events': len(events),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database with load-test data")
+    parser.add_argument("--leads", type=int, default=50_000)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42, help="random seed, same seed = same data")
+    parser.add_argument("--reset", action="store_true", help="delete previously seeded rows first")
+    parser.add_argument("--user", default="loadtest@example.com", help="login the driver uses")
+    parser.add_argument("--password", default="loadtest")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if args.reset:
+        reset(engine)
+        print("✓ Removed previously seeded rows")
+
+    started = time.perf_counter()
+    try:
+        counts = seed(args.leads, args.posts, args.seed, engine)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        raise SystemExit(1)
+
+    print(f"✓ Seeded in {time.perf_counter() - started:.1f} s: "
+          + ", ".join(f"{count} {table}" for table, count in counts.items()))
+    create_user(args.user, args.password)
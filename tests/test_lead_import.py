@@ -0,0 +1,82 @@
+"""
+Bulk lead import: merge rules on SQLite (batched fallback) and, when
+TEST_DATABASE_URL points at a scratch PostgreSQL database, the COPY path.
+"""
+
+import io
+import os
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.extentions import db
+from app.models import Lead
+from app.services.lead_import import import_leads
+
+BACKENDS = ["sqlite", "postgresql"]
+
+
+@pytest.fixture(params=BACKENDS)
+def engine(request, tmp_path):
+    if request.param == "sqlite":
+        url = f"sqlite:///{tmp_path / 'import.db'}"
+    else:
+        url = os.getenv("TEST_DATABASE_URL")
+        if not url:
+            pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(url)
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    yield engine
+    db.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _import(engine, text, fmt="csv"):
+    return import_leads(io.StringIO(text), fmt, engine=engine)
+
+
+def _lead(engine, platform_user_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(Lead.__table__).where(Lead.platform_user_id == platform_user_id)
+        ).mappings().one()
+
+
+def test_new_leads_get_defaults(engine):
+    stats = _import(engine, "platform_user_id,username\nu1,Ann\n")
+
+    assert (stats["inserted"], stats["updated"], stats["invalid"]) == (1, 0, 0)
+    lead = _lead(engine, "u1")
+    assert (lead["platform"], lead["status"], lead["routed"]) == ("facebook", "new", False)
+    # SQL NULL, not the JSON 'null' literal
+    with engine.connect() as conn:
+        assert conn.scalar(select(Lead.id).where(Lead.keywords_matched.is_(None))) == lead["id"]
+
+
+def test_partial_reimport_keeps_stored_values(engine):
+    _import(engine, 'platform_user_id,username,intent_score,keywords_matched\nu1,Ann,0.8,"price,buy"\n')
+
+    stats = _import(engine, "platform_user_id,status\nu1,contacted\n")
+
+    assert (stats["inserted"], stats["updated"]) == (0, 1)
+    lead = _lead(engine, "u1")
+    assert lead["status"] == "contacted"
+    assert (lead["username"], lead["intent_score"], lead["keywords_matched"]) == ("Ann", 0.8, ["price", "buy"])
+
+
+def test_last_duplicate_wins(engine):
+    stats = _import(engine, '{"platform_user_id": "u1", "username": "old"}\n'
+                            '{"platform_user_id": "u1", "username": "new"}\n', fmt="ndjson")
+
+    assert stats["inserted"] == 1
+    assert _lead(engine, "u1")["username"] == "new"
+
+
+def test_invalid_rows_are_reported_not_imported(engine):
+    stats = _import(engine, '{"platform_user_id": "u1", "intent_score": [1]}\n'
+                            '{"platform_user_id": "u2"}\n'
+                            'not json\n', fmt="ndjson")
+
+    assert (stats["valid"], stats["invalid"], stats["inserted"]) == (1, 2, 1)
+    assert [error["line"] for error in stats["errors"]] == [1, 3]
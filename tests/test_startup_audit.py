@@ -0,0 +1,35 @@
+"""
+Entry points must not load modules they don't need, and must import in a
+reasonable time. The time budgets are tripled here so the test doesn't
+depend on how fast the machine running it is, `python -m
+app.services.startup_audit --check` applies the real ones.
+"""
+
+import pytest
+
+from app.services import startup_audit
+
+BUDGET_SLACK = 3
+
+
+@pytest.fixture(autouse=True)
+def database_url(monkeypatch):
+    # The web entry point builds the app, which needs a database URL (never connected to)
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+
+
+@pytest.mark.parametrize("entry", sorted(startup_audit.ENTRY_POINTS))
+def test_entry_point_imports(entry):
+    problems = startup_audit.audit(entry, top=0, budget_slack=BUDGET_SLACK)
+    assert problems == []
+
+
+def test_forbidden_module_is_reported(monkeypatch):
+    monkeypatch.setitem(startup_audit.ENTRY_POINTS, "json", ("json", 10_000, ("json.decoder",)))
+    assert startup_audit.audit("json", top=0) == ["json: imports json.decoder"]
+
+
+def test_budget_is_enforced(monkeypatch):
+    monkeypatch.setitem(startup_audit.ENTRY_POINTS, "json", ("json", 0, ()))
+    problems = startup_audit.audit("json", top=0)
+    assert len(problems) == 1 and "exceeds the 0 ms budget" in problems[0]